@@ -1,13 +1,25 @@
+import time
+
+_START_TIME = time.perf_counter()
+
+import functools
 import os
-import fitz  # PyMuPDF
+import queue
 import re
+import sys
+import threading
+import zipfile
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from tkinter.ttk import Progressbar
-import pandas as pd
+from xml.sax.saxutils import escape
+
+# Těžké knihovny (PyMuPDF) se načítají až při prvním použití, aby se okno otevřelo rychle.
 
 def extract_xmp_metadata(file_path):
     try:
+        import fitz  # PyMuPDF
+
         doc = fitz.open(file_path)
 
         for xref in range(1, doc.xref_length()):
@@ -60,6 +72,137 @@ def check_folder_for_pdf_a(folder_path, progress_callback=None):
 
     return results
 
+WATCH_DEBOUNCE_SECONDS = 1.5
+WATCH_POLL_INTERVAL_SECONDS = 5.0
+
+def is_pdf_path(path):
+    return path.lower().endswith('.pdf')
+
+def snapshot_pdf_files(folder_path):
+    snapshot = {}
+    for root_dir, _, files in os.walk(folder_path):
+        for file in files:
+            if is_pdf_path(file):
+                file_path = os.path.join(root_dir, file)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                snapshot[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+class PdfFolderWatcher:
+    # Sleduje složku (watchdog, případně polling pro síťové disky), shlukuje dávky zápisů
+    # a znovu kontroluje jen vytvořené/změněné soubory. on_update(changed, removed) běží ve vlákně watcheru.
+    def __init__(self, folder_path, on_update, use_polling=False,
+                 debounce=WATCH_DEBOUNCE_SECONDS, poll_interval=WATCH_POLL_INTERVAL_SECONDS):
+        self.folder_path = folder_path
+        self.on_update = on_update
+        self.use_polling = use_polling
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._pending = {}  # cesta -> čas poslední události
+        self._removed = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._observer = None
+        self._snapshot = {}
+        self._thread = None
+
+    def start(self):
+        if not self.use_polling:
+            try:
+                self._start_observer()
+            except Exception:
+                # watchdog není k dispozici nebo nepodporuje daný disk -> polling
+                self._observer = None
+                self.use_polling = True
+        if self.use_polling:
+            self._snapshot = snapshot_pdf_files(self.folder_path)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _start_observer(self):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    watcher._touch(event.src_path)
+
+            def on_modified(self, event):
+                if not event.is_directory:
+                    watcher._touch(event.src_path)
+
+            def on_deleted(self, event):
+                if not event.is_directory:
+                    watcher._remove(event.src_path)
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    watcher._remove(event.src_path)
+                    watcher._touch(event.dest_path)
+
+        observer = Observer()
+        observer.schedule(Handler(), self.folder_path, recursive=True)
+        observer.start()
+        self._observer = observer
+
+    def _touch(self, path):
+        if is_pdf_path(path):
+            path = os.path.normpath(path)
+            with self._lock:
+                self._pending[path] = time.monotonic()
+                self._removed.discard(path)
+
+    def _remove(self, path):
+        if is_pdf_path(path):
+            path = os.path.normpath(path)
+            with self._lock:
+                self._pending.pop(path, None)
+                self._removed.add(path)
+
+    def _poll(self):
+        snapshot = snapshot_pdf_files(self.folder_path)
+        for path, signature in snapshot.items():
+            if self._snapshot.get(path) != signature:
+                self._touch(path)
+        for path in self._snapshot.keys() - snapshot.keys():
+            self._remove(path)
+        self._snapshot = snapshot
+
+    def _flush(self):
+        now = time.monotonic()
+        with self._lock:
+            ready = [path for path, last_event in self._pending.items() if now - last_event >= self.debounce]
+            for path in ready:
+                del self._pending[path]
+            removed = self._removed
+            self._removed = set()
+        if ready or removed:
+            self.on_update(ready, removed)
+
+    def _run(self):
+        next_poll = time.monotonic() + self.poll_interval
+        while not self._stop_event.wait(0.25):
+            if self.use_polling and time.monotonic() >= next_poll:
+                self._poll()
+                next_poll = time.monotonic() + self.poll_interval
+            self._flush()
+
 def select_folder():
     folder_path = filedialog.askdirectory(title="Vyberte složku")
     if folder_path:
@@ -72,6 +215,9 @@ def run_check():
         messagebox.showerror("Chyba", "Vyberte prosím platnou složku.")
         return
 
+    if watcher is not None and os.path.normpath(watcher.folder_path) != os.path.normpath(folder_path):
+        stop_watch()
+
     results_table.delete(*results_table.get_children())
 
     progress_bar["value"] = 0
@@ -83,14 +229,172 @@ def run_check():
         progress_label.config(text=f"Zpracovávám soubor {current} z {total}...")
         root.update_idletasks()
 
-    global results
+    global results, results_folder
     results = check_folder_for_pdf_a(folder_path, update_progress)
+    results_by_path.clear()
+    results_folder = os.path.normpath(folder_path)
 
     for file_name, file_path, result in results:
-        results_table.insert("", tk.END, values=(file_name, result))
+        file_path = os.path.normpath(file_path)
+        results_by_path[file_path] = (file_name, file_path, result)
+        results_table.insert("", tk.END, iid=file_path, values=(file_name, result))
 
     progress_label.config(text="Analýza dokončena.")
 
+_XML_ILLEGAL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+def on_watch_update(generation, changed, removed):
+    # Běží ve vlákně watcheru: kontrola PDF mimo GUI, výsledky předá frontou do hlavního vlákna.
+    # generation označí výsledky watcheru, který je poslal; výsledky dříve zastaveného watcheru se zahodí.
+    checked = []
+    for file_path in changed:
+        if os.path.exists(file_path):
+            checked.append((os.path.basename(file_path), file_path, check_pdf_a_compliance_xmp(file_path)))
+        else:
+            removed = set(removed) | {file_path}
+    watch_queue.put((generation, checked, removed))
+
+def drain_watch_queue():
+    while True:
+        try:
+            watch_queue.get_nowait()
+        except queue.Empty:
+            return
+
+def apply_watch_updates():
+    global results, watch_after_id
+    updated = 0
+    while True:
+        try:
+            generation, checked, removed = watch_queue.get_nowait()
+        except queue.Empty:
+            break
+        if generation != watch_generation:
+            continue
+        for file_path in removed:
+            results_by_path.pop(file_path, None)
+            if results_table.exists(file_path):
+                results_table.delete(file_path)
+        for file_name, file_path, result in checked:
+            results_by_path[file_path] = (file_name, file_path, result)
+            if results_table.exists(file_path):
+                results_table.item(file_path, values=(file_name, result))
+            else:
+                results_table.insert("", tk.END, iid=file_path, values=(file_name, result))
+        updated += len(checked) + len(removed)
+
+    if updated:
+        results = list(results_by_path.values())
+        progress_label.config(text=f"Sledování: aktualizováno {updated} souborů ({time.strftime('%H:%M:%S')}).")
+    watch_after_id = root.after(250, apply_watch_updates) if watcher is not None else None
+
+def start_watch():
+    global watcher, watch_after_id, watch_generation
+    folder_path = folder_entry.get()
+    if not folder_path or not os.path.exists(folder_path):
+        messagebox.showerror("Chyba", "Vyberte prosím platnou složku.")
+        return
+
+    # Tabulka musí odpovídat sledované složce, jinak se nejdřív zkontroluje celá nová složka
+    if results_folder != os.path.normpath(folder_path):
+        run_check()
+
+    watch_generation += 1
+    drain_watch_queue()
+    # UNC cesty (síťové disky) watchdog spolehlivě nehlásí -> polling
+    use_polling = polling_var.get() or folder_path.startswith(("\\\\", "//"))
+    watcher = PdfFolderWatcher(folder_path, functools.partial(on_watch_update, watch_generation),
+                               use_polling=use_polling)
+    watcher.start()
+    mode = "polling" if watcher.use_polling else "události systému souborů"
+    progress_label.config(text=f"Sledování složky zapnuto ({mode}).")
+    watch_button.config(text="Zastavit sledování", command=stop_watch)
+    watch_after_id = root.after(250, apply_watch_updates)
+
+def stop_watch():
+    global watcher, watch_after_id, watch_generation
+    if watcher is not None:
+        watcher.stop()
+        watcher = None
+    # Kontrola, která doběhne až po stop(), už se do tabulky nedostane
+    watch_generation += 1
+    drain_watch_queue()
+    if watch_after_id is not None:
+        root.after_cancel(watch_after_id)
+        watch_after_id = None
+    watch_button.config(text="Sledovat změny", command=start_watch)
+    progress_label.config(text="Sledování složky vypnuto.")
+
+def on_close():
+    if watcher is not None:
+        watcher.stop()
+    root.destroy()
+
+def _column_letter(index):
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def _xlsx_cell(ref, value):
+    if isinstance(value, bool) or value is None:
+        value = "" if value is None else str(value)
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    text = escape(_XML_ILLEGAL_CHARS.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def write_xlsx(file_path, header, rows, sheet_name="List1"):
+    # Minimální zápis XLSX (jeden list, inline řetězce) bez pandas/openpyxl.
+    sheet_rows = []
+    for row_index, row in enumerate([header, *rows], start=1):
+        cells = "".join(_xlsx_cell(f"{_column_letter(col)}{row_index}", value) for col, value in enumerate(row))
+        sheet_rows.append(f'<row r="{row_index}">{cells}</row>')
+
+    sheet_xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f'<sheetData>{"".join(sheet_rows)}</sheetData></worksheet>'
+    )
+    workbook_xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{escape(sheet_name)}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    )
+    workbook_rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/></Relationships>'
+    )
+    root_rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/></Relationships>'
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    )
+
+    with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", content_types)
+        archive.writestr("_rels/.rels", root_rels)
+        archive.writestr("xl/workbook.xml", workbook_xml)
+        archive.writestr("xl/_rels/workbook.xml.rels", workbook_rels)
+        archive.writestr("xl/worksheets/sheet1.xml", sheet_xml)
+
 def export_to_excel():
     if not results:
         messagebox.showerror("Chyba", "Žádné výsledky k exportu.")
@@ -105,8 +409,7 @@ def export_to_excel():
         return
 
     try:
-        df = pd.DataFrame(results, columns=["Název souboru", "Cesta k souboru", "Výsledek kontroly"])
-        df.to_excel(file_path, index=False)
+        write_xlsx(file_path, ["Název souboru", "Cesta k souboru", "Výsledek kontroly"], results)
         messagebox.showinfo("Úspěch", f"Výsledky byly úspěšně exportovány do {file_path}.")
     except Exception as e:
         messagebox.showerror("Chyba", f"Export selhal: {str(e)}")
@@ -132,6 +435,17 @@ browse_button.pack(side=tk.LEFT, padx=5)
 run_button = tk.Button(root, text="Spustit kontrolu", command=run_check)
 run_button.pack(pady=5)
 
+# Průběžné sledování složky (jen vytvořené/změněné soubory)
+watch_frame = tk.Frame(root)
+watch_frame.pack(pady=5)
+
+watch_button = tk.Button(watch_frame, text="Sledovat změny", command=start_watch)
+watch_button.pack(side=tk.LEFT, padx=5)
+
+polling_var = tk.BooleanVar(value=False)
+polling_check = tk.Checkbutton(watch_frame, text="Polling (síťové disky)", variable=polling_var)
+polling_check.pack(side=tk.LEFT, padx=5)
+
 # Tlačítko pro export do Excelu
 export_button = tk.Button(root, text="Exportovat do Excelu", command=export_to_excel)
 export_button.pack(pady=5)
@@ -151,6 +465,28 @@ results_table.heading("Výsledek kontroly", text="Výsledek kontroly")
 results_table.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
 
 results = []
+results_by_path = {}
+results_folder = None
+watcher = None
+watch_generation = 0
+watch_after_id = None
+watch_queue = queue.Queue()
+
+root.protocol("WM_DELETE_WINDOW", on_close)
+
+def report_startup_time():
+    # Čas od spuštění skriptu do prvního nečinného cyklu okna; zapisuje se do startup_time.log vedle programu.
+    elapsed_ms = (time.perf_counter() - _START_TIME) * 1000.0
+    base_dir = os.path.dirname(sys.executable if getattr(sys, "frozen", False) else os.path.abspath(__file__))
+    log_path = os.path.join(base_dir, "startup_time.log")
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        log_file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{elapsed_ms:.1f} ms\n")
+    print(f"Start aplikace: {elapsed_ms:.1f} ms")
+    root.destroy()
+
+# Měření doby startu pro sledování regresí: export_pdf.exe --startup-time
+if "--startup-time" in sys.argv:
+    root.after_idle(report_startup_time)
 
 # Spuštění hlavní smyčky
 root.mainloop()
@@ -10,7 +10,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['pandas', 'pyarrow', 'numpy', 'lxml', 'PIL', 'matplotlib'],
     noarchive=False,
     optimize=0,
 )
@@ -0,0 +1,217 @@
+import argparse
+import contextlib
+import glob
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import ifcopenshell
+import pandas as pd
+
+from ifc_stream import StreamingIfcReader
+from ifc_to_xlsx import columns_to_dataframe, extract_ifc_columns
+
+# Files larger than this are split by entity type across the workers
+SPLIT_THRESHOLD_MB = 200
+SCAN_CHUNK_BYTES = 16 * 1024 * 1024
+# Rows per worksheet including the header row
+EXCEL_MAX_ROWS = 1048576
+
+_ENTITY_PATTERN = re.compile(rb'#\d+\s*=\s*(IFC[A-Z0-9_]+)\s*\(')
+_SCHEMA_PATTERN = re.compile(rb"FILE_SCHEMA\s*\(\s*\(\s*'([^']+)'")
+
+
+def scan_entity_counts(ifc_path):
+    # Count instances per (upper case) entity name by reading the STEP file in chunks,
+    # without loading the model. Returns (schema name, {ENTITY NAME: count}).
+    counts = {}
+    schema_name = None
+    tail = b''
+    with open(ifc_path, 'rb') as ifc_stream:
+        while True:
+            chunk = ifc_stream.read(SCAN_CHUNK_BYTES)
+            if not chunk:
+                break
+            data = tail + chunk
+            # Keep the unfinished last line for the next chunk
+            cut = data.rfind(b';')
+            data, tail = data[:cut + 1], data[cut + 1:]
+            if schema_name is None:
+                match = _SCHEMA_PATTERN.search(data)
+                if match:
+                    schema_name = match.group(1).decode('ascii')
+            for match in _ENTITY_PATTERN.finditer(data):
+                name = match.group(1)
+                counts[name] = counts.get(name, 0) + 1
+    return schema_name, {name.decode('ascii'): count for name, count in counts.items()}
+
+
+def product_classes(schema_name):
+    # {ENTITY NAME: IfcEntityName} for every IfcProduct subtype of the schema
+    schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(schema_name)
+    classes = {}
+    for declaration in schema.declarations():
+        if not isinstance(declaration, ifcopenshell.ifcopenshell_wrapper.entity):
+            continue
+        supertype = declaration
+        while supertype is not None:
+            if supertype.name() == 'IfcProduct':
+                classes[declaration.name().upper()] = declaration.name()
+                break
+            supertype = supertype.supertype()
+    return classes
+
+
+def split_by_type(ifc_path, workers):
+    # Group the concrete product classes present in the file into at most `workers`
+    # buckets of roughly equal instance counts (largest classes first).
+    schema_name, counts = scan_entity_counts(ifc_path)
+    classes = product_classes(schema_name or 'IFC4')
+    present = sorted(
+        ((count, classes[name]) for name, count in counts.items() if name in classes),
+        reverse=True,
+    )
+    buckets = [[0, []] for _ in range(max(1, min(workers, len(present))))]
+    for count, ifc_class in present:
+        bucket = min(buckets, key=lambda item: item[0])
+        bucket[0] += count
+        bucket[1].append(ifc_class)
+    return [sorted(ifc_classes) for _, ifc_classes in buckets if ifc_classes]
+
+
+def _extract_task(ifc_path, ifc_classes):
+    # Runs in a worker process; returns {column name: list of values} for the given classes (None = all IfcProduct).
+    # A whole file is parsed by ifcopenshell. A bucket of a split file is read with the streaming reader,
+    # which maps the file and decodes only the bucket's elements and their property sets,
+    # so no worker of a split file holds the whole model.
+    if ifc_classes is None:
+        return extract_ifc_columns(ifcopenshell.open(ifc_path))
+    with StreamingIfcReader(ifc_path) as reader:
+        return reader.extract_columns(ifc_classes, include_subtypes=False)
+
+
+def _merge_parts(ifc_path, parts):
+    # Parts are joined as plain columns and typed once, so a split file gives the same table (values and dtypes)
+    # as the file read in one piece; cells of columns a bucket doesn't have stay None, not NaN.
+    # Deterministic row order regardless of worker scheduling: by STEP id within a file.
+    total = sum(len(part['id']) for part in parts)
+    columns, offset = {}, 0
+    for part in parts:
+        count = len(part['id'])
+        for name, values in part.items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = [None] * total
+            column[offset:offset + count] = values
+        offset += count
+    order = sorted(range(total), key=columns['id'].__getitem__)
+    df = columns_to_dataframe({name: [values[index] for index in order] for name, values in columns.items()})
+    df.insert(0, 'Source File', os.path.basename(ifc_path))
+    return df
+
+
+def _unique_sheet_name(base, used):
+    # Excel sheet names: at most 31 characters, unique regardless of case
+    base = base[:31]
+    name, suffix = base, 1
+    while name.lower() in used:
+        suffix += 1
+        name = f'{base[:31 - len(str(suffix)) - 1]}_{suffix}'
+    used.add(name.lower())
+    return name
+
+
+def _sheet_names(ifc_paths):
+    used = set()
+    return {
+        ifc_path: _unique_sheet_name(os.path.splitext(os.path.basename(ifc_path))[0], used)
+        for ifc_path in ifc_paths
+    }
+
+
+def _write_sheets(writer, df, sheet_name, used):
+    # Tables longer than one worksheet continue on '<name>_2', '<name>_3', ...
+    rows_per_sheet = EXCEL_MAX_ROWS - 1
+    for start in range(0, max(len(df), 1), rows_per_sheet):
+        name = sheet_name if start == 0 else _unique_sheet_name(f'{sheet_name}_{start // rows_per_sheet + 1}', used)
+        df.iloc[start:start + rows_per_sheet].to_excel(writer, sheet_name=name, index=False)
+
+
+def _is_missing(value):
+    # None, pd.NA and float NaN; other values (including strings and numbers) are kept
+    return value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value))
+
+
+def _write_parquet(df, output_path):
+    # Parquet needs one type per column; columns of mixed IFC values are written as text
+    for name in df.columns:
+        if df[name].dtype == object:
+            df[name] = df[name].map(lambda value: None if _is_missing(value) else str(value))
+    df.to_parquet(output_path, index=False)
+
+
+def convert_batch(ifc_paths, output, workers=None, split_threshold_mb=SPLIT_THRESHOLD_MB, max_tasks_per_child=1):
+    # Convert many IFC files in a process pool. Large files are split by entity type.
+    # output ending with .xlsx -> one workbook with a sheet per IFC file, otherwise a directory of Parquet files.
+    # The XLSX workbook itself is still built in memory by openpyxl, Parquet is the better fit for very large models.
+    # Each worker process is recycled after max_tasks_per_child tasks so its model memory is released.
+    workers = workers or os.cpu_count() or 1
+    to_excel = output.lower().endswith('.xlsx')
+    if not to_excel:
+        os.makedirs(output, exist_ok=True)
+
+    tasks = []
+    for ifc_path in ifc_paths:
+        if os.path.getsize(ifc_path) > split_threshold_mb * 1024 * 1024 and workers > 1:
+            tasks.extend((ifc_path, ifc_classes) for ifc_classes in split_by_type(ifc_path, workers))
+        else:
+            tasks.append((ifc_path, None))
+
+    remaining = {ifc_path: 0 for ifc_path in ifc_paths}
+    for ifc_path, _ in tasks:
+        remaining[ifc_path] += 1
+
+    parts = {ifc_path: [] for ifc_path in ifc_paths}
+    sheet_names = _sheet_names(ifc_paths)
+    used_sheet_names = {name.lower() for name in sheet_names.values()}
+
+    with contextlib.ExitStack() as stack:
+        writer = stack.enter_context(pd.ExcelWriter(output)) if to_excel else None
+        executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=max_tasks_per_child))
+        futures = [(ifc_path, executor.submit(_extract_task, ifc_path, ifc_classes)) for ifc_path, ifc_classes in tasks]
+        for ifc_path, future in futures:
+            parts[ifc_path].append(future.result())
+            remaining[ifc_path] -= 1
+            if remaining[ifc_path]:
+                continue
+
+            # Written as soon as the file is complete, so the parent keeps at most one merged table
+            df = _merge_parts(ifc_path, parts.pop(ifc_path))
+            if to_excel:
+                _write_sheets(writer, df, sheet_names[ifc_path], used_sheet_names)
+            else:
+                _write_parquet(df, os.path.join(output, sheet_names[ifc_path] + '.parquet'))
+
+
+def _expand_inputs(inputs):
+    ifc_paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            ifc_paths.extend(sorted(glob.glob(os.path.join(item, '**', '*.ifc'), recursive=True)))
+        else:
+            ifc_paths.extend(sorted(glob.glob(item)) or [item])
+    # Deterministic, duplicate-free order
+    return list(dict.fromkeys(os.path.abspath(path) for path in ifc_paths))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Parallel conversion of IFC files to XLSX or Parquet.')
+    parser.add_argument('inputs', nargs='+', help='IFC files, folders or glob patterns')
+    parser.add_argument('-o', '--output', required=True, help='output .xlsx workbook or folder for Parquet files')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--split-threshold-mb', type=float, default=SPLIT_THRESHOLD_MB,
+                        help='split files larger than this by entity type')
+    args = parser.parse_args()
+
+    convert_batch(_expand_inputs(args.inputs), args.output, args.workers, args.split_threshold_mb)
@@ -0,0 +1,277 @@
+import argparse
+import csv
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import deque
+
+from ifc_stream import StreamingIfcReader
+
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'AC20-FZK-Haus.ifc')
+DEFAULT_SCALES = (10, 100, 1000)
+# Larger tables skip the XLSX export stage (0 skips it always)
+DEFAULT_EXPORT_MAX_ROWS = 5000
+
+# Entities shared by every replica (together with everything they reference):
+# project/site/building, owner history, units, contexts, type objects and the property sets themselves
+SHARED_ROOT_TYPES = {
+    'IFCPROJECT', 'IFCSITE', 'IFCBUILDING', 'IFCOWNERHISTORY', 'IFCUNITASSIGNMENT',
+    'IFCGEOMETRICREPRESENTATIONCONTEXT', 'IFCGEOMETRICREPRESENTATIONSUBCONTEXT',
+    'IFCPROPERTYSET', 'IFCELEMENTQUANTITY',
+}
+
+_GUID_CHARS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_$'
+_TEMPLATE_PATTERN = re.compile(rb"'(?:[^']|'')*'|#(\d+)")
+_GUID_ARGUMENT_PATTERN = re.compile(rb"\('[0-9A-Za-z_$]{22}'")
+_ROOTED_PATTERN = re.compile(rb"\('[0-9A-Za-z_$]{22}',#(\d+)")
+
+
+def new_guid():
+    # 128 bit UUID in the 22 character IFC base64 encoding
+    number = uuid.uuid4().int
+    chars = []
+    for _ in range(22):
+        number, remainder = divmod(number, 64)
+        chars.append(_GUID_CHARS[remainder])
+    return ''.join(reversed(chars))
+
+
+def _is_shared_root(entity_type):
+    return entity_type in SHARED_ROOT_TYPES or (entity_type.endswith('TYPE') and not entity_type.startswith('IFCREL'))
+
+
+def inflate_model(source_path, output_path, scale):
+    # Write a synthetic model with `scale` copies of the source: storeys, elements, geometry and
+    # relationships are replicated with fresh GlobalIds and shifted step ids, while the shared entities
+    # above (including property sets) are referenced by all copies. Copies overlap geometrically.
+    with StreamingIfcReader(source_path) as reader:
+        entities = {}
+        for entity_id in reader.ids():
+            entity_type, raw = reader.raw(entity_id)
+            # Template: literal pieces alternating with referenced ids, strings left untouched
+            pieces, refs, last = [], [], 0
+            for match in _TEMPLATE_PATTERN.finditer(raw):
+                if match.group(1) is not None:
+                    pieces.append(raw[last:match.start()])
+                    refs.append(int(match.group(1)))
+                    last = match.end()
+            pieces.append(raw[last:])
+            entities[entity_id] = (entity_type, pieces, refs)
+
+    shared = {entity_id for entity_id, (entity_type, _, _) in entities.items() if _is_shared_root(entity_type)}
+    pending = deque(shared)
+    while pending:
+        for ref in entities[pending.popleft()][2]:
+            if ref not in shared and ref in entities:
+                shared.add(ref)
+                pending.append(ref)
+
+    # Types carrying a GlobalId: those whose instances reference an IfcOwnerHistory right after the first string
+    # (a 22 character property name alone would be mistaken for a GlobalId)
+    rooted_types = set()
+    for entity_type, pieces, refs in entities.values():
+        match = _ROOTED_PATTERN.match(pieces[0] + b'#%d' % refs[0]) if refs else None
+        if match and entities.get(int(match.group(1)), ('',))[0] == 'IFCOWNERHISTORY':
+            rooted_types.add(entity_type)
+
+    # Relationships that only connect shared entities (e.g. project -> site) are not duplicated
+    copied = [
+        entity_id for entity_id, (entity_type, _, refs) in entities.items()
+        if entity_id not in shared and not (entity_type.startswith('IFCREL') and all(ref in shared for ref in refs))
+    ]
+    id_step = max(entities) + 1
+
+    with open(source_path, 'rb') as source:
+        header = source.read(_header_size(source_path))
+
+    with open(output_path, 'wb') as output:
+        output.write(header)
+        for entity_id, (entity_type, pieces, refs) in entities.items():
+            output.write(_render(entity_id, entity_type, pieces, refs, shared, 0, new_guids=False))
+        for copy_index in range(1, scale):
+            offset = copy_index * id_step
+            output.write(b''.join(
+                _render(entity_id, *entities[entity_id], shared, offset, entities[entity_id][0] in rooted_types)
+                for entity_id in copied
+            ))
+        output.write(b'ENDSEC;\nEND-ISO-10303-21;\n')
+
+
+def _header_size(ifc_path):
+    # Byte length of everything up to and including the 'DATA;' line
+    with open(ifc_path, 'rb') as stream:
+        head = stream.read(1024 * 1024)
+    position = head.find(b'DATA;')
+    return head.index(b'\n', position) + 1
+
+
+def _render(entity_id, entity_type, pieces, refs, shared, offset, new_guids):
+    parts = [b'#%d=%s' % (entity_id + offset, entity_type.encode('ascii'))]
+    for piece, ref in zip(pieces, refs):
+        parts.append(piece)
+        parts.append(b'#%d' % (ref if ref in shared else ref + offset))
+    parts.append(pieces[-1])
+    text = b''.join(parts)
+    if new_guids:
+        head = len(parts[0])
+        if _GUID_ARGUMENT_PATTERN.match(text, head):
+            text = text[:head + 2] + new_guid().encode('ascii') + text[head + 24:]
+    return text + b'\n'
+
+
+def peak_rss_mb():
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        try:
+            import psutil
+
+            return psutil.Process().memory_info().peak_wset / 1024 / 1024
+        except (ImportError, AttributeError):
+            return None
+
+
+def run_stages(ifc_path, export_max_rows=DEFAULT_EXPORT_MAX_ROWS):
+    # Runs in a fresh process per model so peak RSS belongs to that model only.
+    # Stages run from the lightest to the heaviest, so the growing peak is attributable per stage.
+    # Yields one result per stage; a failing stage is recorded in its note and the later stages go on.
+    state = {}
+
+    def result(name, seconds, rows, note=''):
+        return {'stage': name, 'seconds': None if seconds is None else round(seconds, 4), 'rows': rows,
+                'rows_per_s': round(rows / seconds, 1) if rows and seconds else None,
+                'peak_rss_mb': peak_rss_mb(), 'note': note}
+
+    def stage(name, function):
+        started = time.perf_counter()
+        try:
+            rows = function()
+        except ImportError as exc:
+            return result(name, None, None, f'skipped: {exc}')
+        except Exception as exc:  # MemoryError included, the child keeps reporting
+            return result(name, time.perf_counter() - started, None, f'failed: {type(exc).__name__}: {exc}')
+        return result(name, time.perf_counter() - started, rows)
+
+    def stream_index():
+        state['reader'] = StreamingIfcReader(ifc_path)
+        return len(state['reader'])
+
+    def stream_extract():
+        return len(state['reader'].extract(['IfcWall', 'IfcWallStandardCase']))
+
+    def load():
+        import ifcopenshell
+
+        state['model'] = ifcopenshell.open(ifc_path)
+        return len(state['model'].by_type('IfcProduct'))
+
+    def extract_dict():
+        from ifc_to_xlsx import extract_ifc_data
+
+        return len(extract_ifc_data(state['model']))
+
+    def extract_columns():
+        from ifc_to_xlsx import columns_to_dataframe, extract_ifc_columns
+
+        state['table'] = columns_to_dataframe(extract_ifc_columns(state['model']))
+        return len(state['table'])
+
+    def export_xlsx():
+        from ifc_to_xlsx import create_excel
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            create_excel(state['table'], os.path.join(temp_dir, 'export.xlsx'))
+        return len(state['table'])
+
+    yield stage('stream_index', stream_index)
+    if 'reader' in state:
+        yield stage('stream_extract', stream_extract)
+        state.pop('reader').close()
+    yield stage('load', load)
+    if 'model' in state:
+        yield stage('extract_dict', extract_dict)
+        yield stage('extract_columns', extract_columns)
+    if 'table' in state:
+        # openpyxl keeps every cell in memory, the export dominates run time and RSS of large models
+        if len(state['table']) > export_max_rows:
+            yield result('export_xlsx', None, None, f'skipped: {len(state["table"])} rows > --export-max-rows')
+        else:
+            yield stage('export_xlsx', export_xlsx)
+
+
+def run_benchmark(source_path, scales, work_dir, regenerate=False, export_max_rows=DEFAULT_EXPORT_MAX_ROWS):
+    os.makedirs(work_dir, exist_ok=True)
+    rows = []
+    for scale in (1, *scales):
+        if scale == 1:
+            model_path = source_path
+        else:
+            model_path = os.path.join(work_dir, f'{os.path.splitext(os.path.basename(source_path))[0]}_x{scale}.ifc')
+            if regenerate or not os.path.exists(model_path):
+                started = time.perf_counter()
+                inflate_model(source_path, model_path, scale)
+                print(f'Inflated x{scale} in {time.perf_counter() - started:.1f} s -> {model_path}')
+
+        # The child prints one JSON line per finished stage, so a crashed or OOM-killed child
+        # still leaves the stages it completed
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run-stages', model_path,
+             '--export-max-rows', str(export_max_rows)],
+            capture_output=True, text=True,
+        )
+        size_mb = round(os.path.getsize(model_path) / 1024 / 1024, 1)
+        for line in completed.stdout.splitlines():
+            if line.startswith('{'):
+                rows.append({'scale': scale, 'file_mb': size_mb, **json.loads(line)})
+        if completed.returncode != 0:
+            stderr = completed.stderr.strip().splitlines()
+            note = f'process exited with code {completed.returncode}' + (f': {stderr[-1]}' if stderr else '')
+            rows.append({'scale': scale, 'file_mb': size_mb, 'stage': 'process', 'seconds': None, 'rows': None,
+                         'rows_per_s': None, 'peak_rss_mb': None, 'note': note})
+            print(completed.stderr, file=sys.stderr)
+    return rows
+
+
+def print_table(rows):
+    print(f'{"scale":>6} {"file MB":>9} {"stage":<16} {"seconds":>9} {"rows":>9} {"rows/s":>11} {"peak RSS MB":>12}')
+    for row in rows:
+        def fmt(value, spec):
+            return format(value, spec) if value is not None else format('-', spec[:-3] if spec.endswith('f') else spec)
+        print(f'{row["scale"]:>6} {row["file_mb"]:>9} {row["stage"]:<16} {fmt(row["seconds"], ">9.3f")} '
+              f'{fmt(row["rows"], ">9")} {fmt(row["rows_per_s"], ">11.0f")} {fmt(row["peak_rss_mb"], ">12.1f")} '
+              f'{row["note"]}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Scaling benchmark of the IFC extraction pipeline on inflated models.')
+    parser.add_argument('source', nargs='?', default=DEFAULT_SOURCE, help='source IFC model')
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES))
+    parser.add_argument('--work-dir', default='bench_models', help='folder for the inflated models')
+    parser.add_argument('--regenerate', action='store_true', help='rebuild inflated models even if present')
+    parser.add_argument('--csv', help='write the results to this CSV file')
+    parser.add_argument('--export-max-rows', type=int, default=DEFAULT_EXPORT_MAX_ROWS,
+                        help='skip the XLSX export for tables with more rows (0 = never export)')
+    parser.add_argument('--run-stages', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stages:
+        for result in run_stages(args.run_stages, args.export_max_rows):
+            print(json.dumps(result), flush=True)
+        sys.exit(0)
+
+    rows = run_benchmark(args.source, args.scales, args.work_dir, args.regenerate, args.export_max_rows)
+    print_table(rows)
+    if args.csv:
+        with open(args.csv, 'w', newline='') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
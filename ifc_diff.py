@@ -0,0 +1,149 @@
+import argparse
+import hashlib
+import os
+
+import ifcopenshell
+import pandas as pd
+
+from ifc_to_xlsx import attribute_names, collect_property_sets
+
+# Attributes that change on every export without a real model change
+VOLATILE_ATTRIBUTES = {'OwnerHistory'}
+
+
+def _stable_value(value, names_by_class, digests):
+    # Entity references are replaced by something that survives re-export: the referenced GlobalId
+    # for rooted entities, otherwise a digest of the referenced entity's content
+    if isinstance(value, ifcopenshell.entity_instance):
+        if not value.id():
+            return _stable_value(value.wrappedValue, names_by_class, digests)
+        if value.is_a('IfcRoot'):
+            return value.GlobalId
+        return _entity_digest(value, names_by_class, digests)
+    if isinstance(value, tuple):
+        return tuple(_stable_value(item, names_by_class, digests) for item in value)
+    return value
+
+
+def _attribute_names(entity, names_by_class):
+    ifc_type = entity.is_a()
+    names = names_by_class.get(ifc_type)
+    if names is None:
+        names = names_by_class[ifc_type] = attribute_names(entity.file, ifc_type)
+    return names
+
+
+def _entity_digest(entity, names_by_class, digests):
+    # Placements, shapes, profiles etc. have no GlobalId: hash their attributes recursively, without
+    # step ids and OwnerHistory, so moving or reshaping an element changes the hash of the element.
+    # Digests are memoised by step id, geometry shared between elements is hashed once.
+    digest = digests.get(entity.id())
+    if digest is None:
+        content = tuple(
+            _stable_value(entity[index], names_by_class, digests)
+            for index, name in enumerate(_attribute_names(entity, names_by_class))
+            if name not in VOLATILE_ATTRIBUTES
+        )
+        content_hash = hashlib.blake2b(repr(content).encode('utf-8'), digest_size=8).hexdigest()
+        digest = digests[entity.id()] = f'{entity.is_a()}:{content_hash}'
+    return digest
+
+
+def element_record(element, psets_by_element, names_by_class, digests):
+    # Flat {field: value} for one element: attributes by name, properties as 'Pset.Property'
+    record = {}
+    for index, name in enumerate(_attribute_names(element, names_by_class)):
+        if name in VOLATILE_ATTRIBUTES or name == 'GlobalId':
+            continue
+        value = element[index]
+        if value is not None:
+            record[name] = _stable_value(value, names_by_class, digests)
+    for pset_name, properties, _ in psets_by_element.get(element.id(), ()):
+        for name, value in properties:
+            record[f'{pset_name}.{name}'] = value
+    return record
+
+
+def _digest(ifc_type, record):
+    content = repr((ifc_type, sorted(record.items(), key=lambda item: item[0])))
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+
+class ModelFingerprint:
+    # Content hash per GlobalId of one revision; the full records are rebuilt only for elements that differ
+    def __init__(self, ifc_path, ifc_class='IfcProduct'):
+        self.ifc_file = ifcopenshell.open(ifc_path)
+        self.psets_by_element = collect_property_sets(self.ifc_file)
+        self._names_by_class = {}
+        self._digests = {}
+        self.hashes = {}
+        self.types = {}
+        for element in self.ifc_file.by_type(ifc_class):
+            self.hashes[element.GlobalId] = _digest(element.is_a(), self.record(element))
+            self.types[element.GlobalId] = element.is_a()
+
+    def record(self, element):
+        return element_record(element, self.psets_by_element, self._names_by_class, self._digests)
+
+    def record_by_guid(self, global_id):
+        return self.record(self.ifc_file.by_guid(global_id))
+
+
+def diff_models(old_path, new_path, ifc_class='IfcProduct'):
+    # Returns (added, removed, changes) DataFrames; cost is linear in the number of elements
+    old = ModelFingerprint(old_path, ifc_class)
+    new = ModelFingerprint(new_path, ifc_class)
+
+    added = [guid for guid in new.hashes if guid not in old.hashes]
+    removed = [guid for guid in old.hashes if guid not in new.hashes]
+    modified = [guid for guid, digest in new.hashes.items() if guid in old.hashes and old.hashes[guid] != digest]
+
+    changes = []
+    for guid in modified:
+        old_record, new_record = old.record_by_guid(guid), new.record_by_guid(guid)
+        if old.types[guid] != new.types[guid]:
+            changes.append((guid, new.types[guid], 'type', old.types[guid], new.types[guid]))
+        for field in sorted(old_record.keys() | new_record.keys()):
+            old_value, new_value = old_record.get(field), new_record.get(field)
+            if old_value != new_value:
+                changes.append((guid, new.types[guid], field, old_value, new_value))
+
+    def summary(model, guids):
+        rows = []
+        for guid in guids:
+            element = model.ifc_file.by_guid(guid)
+            rows.append((guid, model.types[guid], element.Name))
+        return pd.DataFrame(rows, columns=['GlobalId', 'Type', 'Name'])
+
+    changes_df = pd.DataFrame(changes, columns=['GlobalId', 'Type', 'Field', 'Old value', 'New value'])
+    # Values of one field can differ in type between revisions; keep them as text for XLSX/Parquet
+    for column in ('Old value', 'New value'):
+        changes_df[column] = changes_df[column].map(lambda value: None if value is None else str(value))
+    return summary(new, added), summary(old, removed), changes_df
+
+
+def write_diff(added, removed, changes, output):
+    # output ending with .xlsx -> one workbook with three sheets, otherwise a folder of Parquet files
+    sheets = {'Added': added, 'Removed': removed, 'Modified': changes}
+    if output.lower().endswith('.xlsx'):
+        with pd.ExcelWriter(output) as writer:
+            for name, df in sheets.items():
+                df.to_excel(writer, sheet_name=name, index=False)
+    else:
+        os.makedirs(output, exist_ok=True)
+        for name, df in sheets.items():
+            df.to_parquet(os.path.join(output, f'{name.lower()}.parquet'), index=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report added, removed and modified elements between two IFC revisions.')
+    parser.add_argument('old_ifc')
+    parser.add_argument('new_ifc')
+    parser.add_argument('-o', '--output', required=True, help='output .xlsx file or folder for Parquet files')
+    parser.add_argument('--ifc-class', default='IfcProduct', help='compare only this class (default IfcProduct)')
+    args = parser.parse_args()
+
+    added, removed, changes = diff_models(args.old_ifc, args.new_ifc, args.ifc_class)
+    write_diff(added, removed, changes, args.output)
+    print(f'Added: {len(added)}, removed: {len(removed)}, '
+          f'modified: {changes["GlobalId"].nunique()} elements / {len(changes)} changes')
@@ -0,0 +1,239 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_DB_PATH = 'ifc_index.sqlite'
+HASH_CHUNK_BYTES = 8 * 1024 * 1024
+
+_SCHEMA_SQL = '''
+CREATE TABLE IF NOT EXISTS files (
+    file_id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    schema TEXT,
+    indexed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS elements (
+    file_id INTEGER NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+    step_id INTEGER NOT NULL,
+    global_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT,
+    attributes TEXT NOT NULL,
+    PRIMARY KEY (file_id, step_id)
+);
+CREATE INDEX IF NOT EXISTS elements_global_id ON elements(global_id);
+CREATE INDEX IF NOT EXISTS elements_type ON elements(type, file_id);
+CREATE TABLE IF NOT EXISTS properties (
+    file_id INTEGER NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+    step_id INTEGER NOT NULL,
+    pset TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value,
+    PRIMARY KEY (file_id, step_id, pset, name)
+);
+CREATE INDEX IF NOT EXISTS properties_value ON properties(pset, name, value);
+CREATE TABLE IF NOT EXISTS supertypes (
+    type TEXT NOT NULL,
+    supertype TEXT NOT NULL,
+    PRIMARY KEY (supertype, type)
+);
+'''
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as stream:
+        for chunk in iter(lambda: stream.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _sql_value(value):
+    # SQLite stores int/float/str natively; everything else is kept as text
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+class IfcIndex:
+    # Persistent SQLite index of IfcProduct elements, their attributes and (type-merged) pset values.
+    # refresh() re-parses a file only when its content hash changed; lookups never open the IFC file.
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        self.connection.executescript(_SCHEMA_SQL)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _file_id(self, ifc_path):
+        row = self.connection.execute('SELECT file_id FROM files WHERE path = ?', (os.path.abspath(ifc_path),)).fetchone()
+        if row is None:
+            raise KeyError(f'{ifc_path} is not indexed, call refresh() first')
+        return row[0]
+
+    def refresh(self, ifc_paths, force=False):
+        # Returns {path: 'indexed' | 'unchanged'}
+        status = {}
+        for ifc_path in ifc_paths:
+            path = os.path.abspath(ifc_path)
+            stat = os.stat(path)
+            row = self.connection.execute(
+                'SELECT file_id, sha256, size, mtime_ns FROM files WHERE path = ?', (path,)
+            ).fetchone()
+
+            # Size and mtime unchanged -> skip even the hash; otherwise compare the content hash
+            if row and not force and (row[2], row[3]) == (stat.st_size, stat.st_mtime_ns):
+                status[ifc_path] = 'unchanged'
+                continue
+            sha256 = file_sha256(path)
+            if row and not force and row[1] == sha256:
+                with self.connection:
+                    self.connection.execute('UPDATE files SET size = ?, mtime_ns = ? WHERE file_id = ?',
+                                            (stat.st_size, stat.st_mtime_ns, row[0]))
+                status[ifc_path] = 'unchanged'
+                continue
+
+            self._rebuild(path, sha256, stat)
+            status[ifc_path] = 'indexed'
+        return status
+
+    def _rebuild(self, path, sha256, stat):
+        import ifcopenshell
+
+        from ifc_to_xlsx import attribute_names, collect_property_sets, plain_value
+
+        ifc_file = ifcopenshell.open(path)
+        psets_by_element = collect_property_sets(ifc_file)
+        schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(ifc_file.schema)
+
+        element_rows, property_rows, supertype_rows = [], [], set()
+        names_by_class = {}
+        for element in ifc_file.by_type('IfcProduct'):
+            ifc_type = element.is_a()
+            names = names_by_class.get(ifc_type)
+            if names is None:
+                names = names_by_class[ifc_type] = attribute_names(ifc_file, ifc_type)
+                declaration = schema.declaration_by_name(ifc_type)
+                while declaration is not None:
+                    supertype_rows.add((ifc_type, declaration.name()))
+                    declaration = declaration.supertype()
+
+            attributes = {}
+            for index, name in enumerate(names):
+                value = element[index]
+                if value is not None:
+                    attributes[name] = _sql_value(plain_value(value))
+            element_rows.append((element.id(), element.GlobalId, ifc_type, element.Name,
+                                 json.dumps(attributes, ensure_ascii=False)))
+
+            # Type psets come first, so INSERT OR REPLACE leaves the occurrence value
+            for pset_name, properties, _ in psets_by_element.get(element.id(), ()):
+                for name, value in properties:
+                    property_rows.append((element.id(), pset_name, name, _sql_value(value)))
+
+        with self.connection:
+            self.connection.execute('DELETE FROM files WHERE path = ?', (path,))
+            file_id = self.connection.execute(
+                'INSERT INTO files (path, sha256, size, mtime_ns, schema, indexed_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (path, sha256, stat.st_size, stat.st_mtime_ns, ifc_file.schema, time.strftime('%Y-%m-%d %H:%M:%S')),
+            ).lastrowid
+            self.connection.executemany(
+                'INSERT INTO elements (file_id, step_id, global_id, type, name, attributes) VALUES (?, ?, ?, ?, ?, ?)',
+                ((file_id, *row) for row in element_rows),
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO properties (file_id, step_id, pset, name, value) VALUES (?, ?, ?, ?, ?)',
+                ((file_id, *row) for row in property_rows),
+            )
+            self.connection.executemany('INSERT OR IGNORE INTO supertypes (type, supertype) VALUES (?, ?)',
+                                        supertype_rows)
+
+    def _element(self, row):
+        file_id, step_id, global_id, ifc_type, attributes = row
+        element = {'id': step_id, 'type': ifc_type, **json.loads(attributes)}
+        element['GlobalId'] = global_id
+        return element
+
+    def by_guid(self, global_id, ifc_path=None):
+        query = 'SELECT file_id, step_id, global_id, type, attributes FROM elements WHERE global_id = ?'
+        params = [global_id]
+        if ifc_path is not None:
+            query += ' AND file_id = ?'
+            params.append(self._file_id(ifc_path))
+        row = self.connection.execute(query, params).fetchone()
+        return self._element(row) if row else None
+
+    def by_type(self, ifc_class, ifc_path=None, include_subtypes=True):
+        if include_subtypes:
+            query = ('SELECT file_id, step_id, global_id, type, attributes FROM elements '
+                     'WHERE type IN (SELECT type FROM supertypes WHERE supertype = ?)')
+        else:
+            query = 'SELECT file_id, step_id, global_id, type, attributes FROM elements WHERE type = ?'
+        params = [ifc_class]
+        if ifc_path is not None:
+            query += ' AND file_id = ?'
+            params.append(self._file_id(ifc_path))
+        return [self._element(row) for row in self.connection.execute(query + ' ORDER BY file_id, step_id', params)]
+
+    def get_psets(self, global_id, ifc_path=None):
+        # Same shape as ifcopenshell.util.element.get_psets: {pset name: {property: value}}
+        query = ('SELECT p.pset, p.name, p.value FROM properties p '
+                 'JOIN elements e ON e.file_id = p.file_id AND e.step_id = p.step_id WHERE e.global_id = ?')
+        params = [global_id]
+        if ifc_path is not None:
+            query += ' AND e.file_id = ?'
+            params.append(self._file_id(ifc_path))
+        psets = {}
+        for pset_name, name, value in self.connection.execute(query, params):
+            psets.setdefault(pset_name, {})[name] = value
+        return psets
+
+    def to_dataframe(self, ifc_path):
+        # Export table with the same layout as ifc_to_xlsx (attributes, then properties by bare name)
+        import pandas as pd
+
+        file_id = self._file_id(ifc_path)
+        rows = {}
+        for step_id, global_id, ifc_type, attributes in self.connection.execute(
+            'SELECT step_id, global_id, type, attributes FROM elements WHERE file_id = ? ORDER BY step_id', (file_id,)
+        ):
+            rows[step_id] = {'Element ID': global_id, 'id': step_id, 'type': ifc_type, **json.loads(attributes)}
+        for step_id, name, value in self.connection.execute(
+            'SELECT step_id, name, value FROM properties WHERE file_id = ? ORDER BY step_id, rowid', (file_id,)
+        ):
+            rows[step_id][name] = value
+        return pd.DataFrame.from_records(list(rows.values()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Maintain a SQLite index of IFC elements and property sets.')
+    parser.add_argument('ifc_paths', nargs='+')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='index database file')
+    parser.add_argument('--force', action='store_true', help='rebuild even when the file is unchanged')
+    parser.add_argument('-o', '--output', help='export the (single) indexed file to this .xlsx')
+    args = parser.parse_args()
+
+    with IfcIndex(args.db) as index:
+        started = time.perf_counter()
+        for ifc_path, state in index.refresh(args.ifc_paths, args.force).items():
+            print(f'{ifc_path}: {state}')
+        print(f'Refresh took {time.perf_counter() - started:.2f} s')
+
+        if args.output:
+            index.to_dataframe(args.ifc_paths[0]).to_excel(args.output, index=False)
@@ -0,0 +1,94 @@
+import os
+
+import ifcopenshell
+import ifcopenshell.geom
+import ifcopenshell.util.shape
+import numpy as np
+import pandas as pd
+
+# Prefixed, so they never collide with quantity-set or property columns of the export (e.g. 'Volume')
+QUANTITY_COLUMNS = [
+    'Geom Volume', 'Geom Surface Area', 'Geom Footprint Area',
+    'Geom BBox Min X', 'Geom BBox Min Y', 'Geom BBox Min Z', 'Geom BBox Max X', 'Geom BBox Max Y', 'Geom BBox Max Z',
+]
+
+
+def _mesh_quantities(geometry):
+    # Per-representation values that don't depend on placement, kept small so the cache doesn't grow with the meshes:
+    # volume (divergence theorem over signed tetrahedra), surface area, the 8 corners of the local bounding box
+    # and the triangle area vectors summed per normal direction, which is all the footprint needs under any rotation.
+    # Returns None for an empty mesh.
+    verts = np.asarray(geometry.verts, dtype=np.float64).reshape(-1, 3)
+    faces = np.asarray(geometry.faces, dtype=np.int64).reshape(-1, 3)
+    if not len(verts):
+        return None
+    v0, v1, v2 = verts[faces[:, 0]], verts[faces[:, 1]], verts[faces[:, 2]]
+    cross = np.cross(v1 - v0, v2 - v0)
+    volume = abs(np.einsum('ij,ij->', v0, np.cross(v1, v2))) / 6.0
+    lengths = np.linalg.norm(cross, axis=1)
+    area = 0.5 * lengths.sum()
+
+    low, high = verts.min(axis=0), verts.max(axis=0)
+    corners = np.array([(x, y, z) for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])])
+
+    valid = lengths > 0
+    directions = np.round(cross[valid] / lengths[valid, None], 6)
+    normals = np.zeros((0, 3))
+    if len(directions):
+        unique, groups = np.unique(directions, axis=0, return_inverse=True)
+        normals = np.zeros((len(unique), 3))
+        np.add.at(normals, groups.reshape(-1), cross[valid])
+    return volume, area, corners, normals
+
+
+def compute_quantities(ifc_file, threads=None, include=None):
+    # Geometry quantity takeoff for every element with a body representation.
+    # The iterator tessellates on `threads` cores; elements sharing a representation (mapped items, types)
+    # share geometry.id, so their mesh quantities are computed once and only re-placed.
+    # The bounding box is that of the placed local box: exact for axis-aligned placements, slightly larger otherwise.
+    settings = ifcopenshell.geom.settings()
+    threads = threads or os.cpu_count() or 1
+    if include is not None:
+        iterator = ifcopenshell.geom.iterator(settings, ifc_file, threads, include=include)
+    else:
+        iterator = ifcopenshell.geom.iterator(settings, ifc_file, threads)
+
+    mesh_cache = {}
+    guids, rows = [], []
+    if iterator.initialize():
+        while True:
+            shape = iterator.get()
+            geometry = shape.geometry
+            if geometry.id not in mesh_cache:
+                mesh_cache[geometry.id] = _mesh_quantities(geometry)
+            cached = mesh_cache[geometry.id]
+
+            if cached is not None:
+                volume, area, corners, normals = cached
+                matrix = np.asarray(ifcopenshell.util.shape.get_shape_matrix(shape), dtype=np.float64)
+                rotation, translation = matrix[:3, :3], matrix[:3, 3]
+                world = corners @ rotation.T + translation
+                # Upward-facing triangles projected onto the XY plane give the footprint
+                normal_z = normals @ rotation[2]
+                footprint = 0.5 * normal_z[normal_z > 0].sum()
+                rows.append((volume, area, footprint, *world.min(axis=0), *world.max(axis=0)))
+                guids.append(shape.guid)
+
+            if not iterator.next():
+                break
+
+    df = pd.DataFrame(np.array(rows, dtype=np.float64).reshape(-1, len(QUANTITY_COLUMNS)), columns=QUANTITY_COLUMNS)
+    df.insert(0, 'Element ID', guids)
+    return df
+
+
+def merge_quantities(df, quantities):
+    # Add the quantity columns to an export table keyed by 'Element ID' (GlobalId); export columns keep their names
+    return df.merge(quantities, on='Element ID', how='left', suffixes=('', ' (geometry)'))
+
+
+if __name__ == '__main__':
+    import sys
+
+    quantities = compute_quantities(ifcopenshell.open(sys.argv[1]))
+    print(quantities.describe())
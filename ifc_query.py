@@ -0,0 +1,162 @@
+import argparse
+import time
+import tracemalloc
+from collections import defaultdict
+
+import ifcopenshell
+import numpy as np
+
+from ifc_to_xlsx import collect_property_sets
+
+
+class ModelQueryIndex:
+    # Inverted indexes over one model, built once:
+    #   type -> ids (every supertype included, like is_a),
+    #   (pset, property, value) -> ids for equality filters,
+    #   (pset, property) -> sorted numeric values + ids for range filters.
+    # Conjunctive queries are answered by intersecting the id sets, smallest first.
+    def __init__(self, ifc_file, ifc_class='IfcProduct', measure_memory=False):
+        self.ifc_file = ifc_file
+        if measure_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+
+        schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(ifc_file.schema)
+        supertypes_by_class = {}
+        ids_by_type = defaultdict(set)
+        ids_by_value = defaultdict(set)
+        numeric = defaultdict(list)
+        psets_by_element = collect_property_sets(ifc_file)
+
+        for element in ifc_file.by_type(ifc_class):
+            element_id = element.id()
+            ifc_type = element.is_a()
+            supertypes = supertypes_by_class.get(ifc_type)
+            if supertypes is None:
+                supertypes, declaration = [], schema.declaration_by_name(ifc_type)
+                while declaration is not None:
+                    supertypes.append(declaration.name())
+                    declaration = declaration.supertype()
+                supertypes_by_class[ifc_type] = supertypes
+            for supertype in supertypes:
+                ids_by_type[supertype].add(element_id)
+
+            # Fold type and occurrence psets first (type first, so the occurrence value wins), then index
+            values = {}
+            for pset_name, properties, _ in psets_by_element.get(element_id, ()):
+                for name, value in properties:
+                    values[(pset_name, name)] = value
+            for key, value in values.items():
+                if value is None:
+                    continue
+                ids_by_value[(*key, value)].add(element_id)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    numeric[key].append((value, element_id))
+
+        self._ids_by_type = dict(ids_by_type)
+        self._ids_by_value = dict(ids_by_value)
+        self._ranges = {}
+        for key, pairs in numeric.items():
+            values = np.fromiter((value for value, _ in pairs), dtype=np.float64, count=len(pairs))
+            ids = np.fromiter((element_id for _, element_id in pairs), dtype=np.int64, count=len(pairs))
+            order = np.argsort(values, kind='stable')
+            self._ranges[key] = (values[order], ids[order])
+
+        self.build_seconds = time.perf_counter() - started
+        # tracemalloc slows the build several times over, build_seconds is then not representative
+        self.timed_under_tracemalloc = measure_memory
+        self.memory_bytes = None
+        if measure_memory:
+            _, self.memory_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    def report(self):
+        text = (f'Index: {len(self._ids_by_type)} types, {len(self._ids_by_value)} property values, '
+                f'{len(self._ranges)} numeric properties, built in {self.build_seconds * 1000:.1f} ms')
+        if self.memory_bytes is not None:
+            text += f', peak {self.memory_bytes / 1024 / 1024:.1f} MB'
+        if self.timed_under_tracemalloc:
+            text += ' (time measured under tracemalloc)'
+        return text
+
+    @staticmethod
+    def _split_key(key):
+        pset_name, _, name = key.partition('.')
+        return pset_name, name
+
+    def query_ids(self, ifc_class=None, where=None, ranges=None):
+        # where:  {'Pset_WallCommon.FireRating': 'REI60'} (a list/set of values means any of them)
+        # ranges: {'Qto_WallBaseQuantities.Width': (0.2, None)} inclusive bounds, None = open
+        candidates = []
+        if ifc_class is not None:
+            candidates.append(self._ids_by_type.get(ifc_class, set()))
+        for key, value in (where or {}).items():
+            pset_name, name = self._split_key(key)
+            values = value if isinstance(value, (list, set, tuple)) else (value,)
+            matched = set()
+            for item in values:
+                matched |= self._ids_by_value.get((pset_name, name, item), set())
+            candidates.append(matched)
+        for key, (low, high) in (ranges or {}).items():
+            values, ids = self._ranges.get(self._split_key(key), (np.empty(0), np.empty(0, dtype=np.int64)))
+            start = 0 if low is None else np.searchsorted(values, low, side='left')
+            stop = len(values) if high is None else np.searchsorted(values, high, side='right')
+            candidates.append(set(ids[start:stop].tolist()))
+
+        if not candidates:
+            return sorted(set().union(*self._ids_by_type.values()))
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for ids in candidates[1:]:
+            if not result:
+                break
+            result &= ids
+        return sorted(result)
+
+    def query(self, ifc_class=None, where=None, ranges=None):
+        return [self.ifc_file.by_id(element_id) for element_id in self.query_ids(ifc_class, where, ranges)]
+
+
+def _parse_value(text):
+    # Command line values may mean text or a number; match both
+    candidates = [text]
+    if text in ('True', 'False'):
+        candidates.append(text == 'True')
+    try:
+        candidates.append(float(text))
+    except ValueError:
+        pass
+    return candidates
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Query IFC elements by type and property values.')
+    parser.add_argument('ifc_path')
+    parser.add_argument('--type', dest='ifc_class', help='IFC class, subtypes included (e.g. IfcWall)')
+    parser.add_argument('--where', action='append', default=[], help='Pset.Property=value (repeatable)')
+    parser.add_argument('--range', action='append', default=[], help='Pset.Property=min:max (repeatable, either may be empty)')
+    parser.add_argument('--memory', action='store_true', help='also report peak index memory (separate build pass)')
+    args = parser.parse_args()
+
+    ifc_file = ifcopenshell.open(args.ifc_path)
+    index = ModelQueryIndex(ifc_file)
+    if args.memory:
+        # Memory comes from a second build under tracemalloc, so the timed build above stays untraced
+        index.memory_bytes = ModelQueryIndex(ifc_file, measure_memory=True).memory_bytes
+    print(index.report())
+
+    where = {}
+    for item in args.where:
+        key, _, value = item.partition('=')
+        where[key] = _parse_value(value)
+    ranges = {}
+    for item in args.range:
+        key, _, bounds = item.partition('=')
+        low, _, high = bounds.partition(':')
+        ranges[key] = (float(low) if low else None, float(high) if high else None)
+
+    started = time.perf_counter()
+    elements = index.query(args.ifc_class, where, ranges)
+    print(f'{len(elements)} elements in {(time.perf_counter() - started) * 1000:.2f} ms')
+    for element in elements:
+        print(f'  #{element.id()} {element.is_a()} {element.GlobalId} {element.Name}')
@@ -0,0 +1,431 @@
+import argparse
+import mmap
+import re
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict, namedtuple
+
+# Streaming ISO 10303-21 (STEP) reader for IFC files.
+# The first pass only records the byte offset of every '#id=' line, entities are decoded on demand,
+# so memory follows the entities a query touches instead of the size of the model.
+
+_ENTITY_PATTERN = re.compile(rb'^[ \t]*#(\d+)[ \t]*=[ \t]*([A-Za-z0-9_]+)[ \t]*\(', re.MULTILINE)
+_SCHEMA_PATTERN = re.compile(rb"FILE_SCHEMA\s*\(\s*\(\s*'([^']+)'")
+_END_PATTERN = re.compile(rb"'(?:[^']|'')*'|;")
+_NUMBER_PATTERN = re.compile(rb'[-+]?(?:\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)')
+_KEYWORD_PATTERN = re.compile(rb'[A-Za-z0-9_]+')
+_STRING_ESCAPE_PATTERN = re.compile(r'\\X2\\((?:[0-9A-Fa-f]{4})*)\\X0\\|\\X4\\((?:[0-9A-Fa-f]{8})*)\\X0\\'
+                                    r'|\\X\\([0-9A-Fa-f]{2})|\\S\\(.)|\\P[A-I]?\\|\\\\')
+
+DECODE_CACHE_SIZE = 4096
+
+Ref = namedtuple('Ref', 'id')
+TypedValue = namedtuple('TypedValue', 'type value')
+
+# Attribute positions shared by IFC2X3 and IFC4
+_REL_RELATED_OBJECTS = 4
+_REL_RELATING = 5
+_TYPE_HAS_PROPERTY_SETS = 5
+_PSET_NAME = 2
+_PSET_HAS_PROPERTIES = 4
+_QTO_QUANTITIES = 5
+_QUANTITY_TYPES = {'IFCQUANTITYLENGTH', 'IFCQUANTITYAREA', 'IFCQUANTITYVOLUME',
+                   'IFCQUANTITYCOUNT', 'IFCQUANTITYWEIGHT', 'IFCQUANTITYTIME', 'IFCQUANTITYNUMBER'}
+
+
+def decode_step_string(raw):
+    # Resolve the ISO 10303-21 string escapes (\X2\..\X0\, \X4\..\X0\, \X\hh, \S\c, \P?\, \\)
+    def replace(match):
+        utf16, utf32, byte, shifted = match.group(1, 2, 3, 4)
+        if utf16 is not None:
+            return bytes.fromhex(utf16).decode('utf-16-be')
+        if utf32 is not None:
+            return bytes.fromhex(utf32).decode('utf-32-be')
+        if byte is not None:
+            return bytes.fromhex(byte).decode('latin-1')
+        if shifted is not None:
+            return chr(ord(shifted) + 128)
+        return '\\' if match.group(0) == '\\\\' else ''
+
+    text = raw.replace("''", "'")
+    return _STRING_ESCAPE_PATTERN.sub(replace, text) if '\\' in text else text
+
+
+def parse_arguments(data, position=0):
+    # Parse a parenthesised STEP parameter list starting at data[position] == '('.
+    # Returns (tuple of values, position after the closing parenthesis).
+    values = []
+    position += 1
+    length = len(data)
+    while position < length:
+        char = data[position]
+        if char in b' \t\r\n,':
+            position += 1
+        elif char == 0x29:  # ')'
+            return tuple(values), position + 1
+        elif char == 0x28:  # '('
+            value, position = parse_arguments(data, position)
+            values.append(value)
+        elif char == 0x27:  # "'"
+            end = position + 1
+            while True:
+                end = data.index(b"'", end)
+                if data[end + 1:end + 2] == b"'":
+                    end += 2
+                    continue
+                break
+            values.append(decode_step_string(data[position + 1:end].decode('utf-8', errors='replace')))
+            position = end + 1
+        elif char == 0x23:  # '#'
+            match = _KEYWORD_PATTERN.match(data, position + 1)
+            values.append(Ref(int(match.group(0))))
+            position = match.end()
+        elif char == 0x24 or char == 0x2A:  # '$' unset, '*' derived
+            values.append(None)
+            position += 1
+        elif char == 0x2E:  # '.' enumeration or boolean
+            end = data.index(b'.', position + 1)
+            keyword = data[position + 1:end].decode('ascii')
+            values.append({'T': True, 'F': False, 'U': None}.get(keyword, keyword))
+            position = end + 1
+        elif char == 0x22:  # '"' binary
+            end = data.index(b'"', position + 1)
+            values.append(data[position + 1:end].decode('ascii'))
+            position = end + 1
+        else:
+            match = _NUMBER_PATTERN.match(data, position)
+            if match:
+                text = match.group(0)
+                values.append(float(text) if any(c in text for c in b'.eE') else int(text))
+                position = match.end()
+            else:
+                # Typed parameter such as IFCLABEL('x') inside a select
+                match = _KEYWORD_PATTERN.match(data, position)
+                inner, position = parse_arguments(data, match.end())
+                values.append(TypedValue(match.group(0).decode('ascii'), inner[0] if len(inner) == 1 else inner))
+    raise ValueError('Unterminated STEP parameter list')
+
+
+class StepEntity:
+    __slots__ = ('id', 'type', 'args', '_names')
+
+    def __init__(self, entity_id, entity_type, args, names=None):
+        self.id = entity_id
+        self.type = entity_type
+        self.args = args
+        self._names = names
+
+    def __getitem__(self, index):
+        return self.args[index]
+
+    def __getattr__(self, name):
+        names = object.__getattribute__(self, '_names')
+        if names and name in names:
+            return self.args[names.index(name)]
+        raise AttributeError(name)
+
+    def __repr__(self):
+        return f'#{self.id}={self.type}{self.args}'
+
+
+class StreamingIfcReader:
+    # Memory-mapped IFC reader: index pass over the '#id=' lines, on-demand decoding with a small LRU cache.
+    # Use as a context manager, or call close() to release the mapping.
+    def __init__(self, ifc_path, cache_size=DECODE_CACHE_SIZE):
+        self.ifc_path = ifc_path
+        self._file = open(ifc_path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._names_by_type = {}
+        self._class_names = {}
+        match = _SCHEMA_PATTERN.search(self._data, 0, 65536)
+        self.schema = match.group(1).decode('ascii') if match else None
+        self._build_index()
+
+    def _build_index(self):
+        ids, offsets = array('q'), array('q')
+        ids_by_type = defaultdict(lambda: array('q'))
+        start = self._data.find(b'DATA;')
+        for match in _ENTITY_PATTERN.finditer(self._data, max(0, start)):
+            entity_id = int(match.group(1))
+            ids.append(entity_id)
+            offsets.append(match.end() - 1)  # position of the opening parenthesis
+            ids_by_type[match.group(2).upper().decode('ascii')].append(entity_id)
+
+        # Exporters write ids in ascending order; sort only when they don't, so lookups can bisect
+        if any(ids[i] > ids[i + 1] for i in range(len(ids) - 1)):
+            order = sorted(range(len(ids)), key=ids.__getitem__)
+            ids = array('q', (ids[i] for i in order))
+            offsets = array('q', (offsets[i] for i in order))
+        self._ids = ids
+        self._offsets = offsets
+        self._ids_by_type = dict(ids_by_type)
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def types(self):
+        return {entity_type: len(ids) for entity_type, ids in self._ids_by_type.items()}
+
+    def _attribute_names(self, entity_type):
+        # Attribute names from the ifcopenshell schema when it is installed, else access by index only
+        if entity_type not in self._names_by_type:
+            names = None
+            try:
+                import ifcopenshell.ifcopenshell_wrapper as wrapper
+
+                declaration = wrapper.schema_by_name(self.schema).declaration_by_name(entity_type)
+                names = tuple(attribute.name() for attribute in declaration.all_attributes())
+            except Exception:
+                pass
+            self._names_by_type[entity_type] = names
+        return self._names_by_type[entity_type]
+
+    def _class_name(self, entity_type):
+        # 'IFCWALL' -> 'IfcWall' as spelled in the schema, the upper case name without ifcopenshell
+        if entity_type not in self._class_names:
+            name = entity_type
+            try:
+                import ifcopenshell.ifcopenshell_wrapper as wrapper
+
+                name = wrapper.schema_by_name(self.schema).declaration_by_name(entity_type).name()
+            except Exception:
+                pass
+            self._class_names[entity_type] = name
+        return self._class_names[entity_type]
+
+    def _subtypes(self, ifc_class):
+        try:
+            import ifcopenshell.ifcopenshell_wrapper as wrapper
+
+            schema = wrapper.schema_by_name(self.schema)
+            pending, found = [schema.declaration_by_name(ifc_class)], set()
+            while pending:
+                declaration = pending.pop()
+                found.add(declaration.name().upper())
+                pending.extend(declaration.subtypes())
+            return found
+        except Exception:
+            return {ifc_class.upper()}
+
+    def ids_by_type(self, ifc_class, include_subtypes=True):
+        names = self._subtypes(ifc_class) if include_subtypes else {ifc_class.upper()}
+        ids = sorted(entity_id for name in names for entity_id in self._ids_by_type.get(name, ()))
+        return array('q', ids)
+
+    def ids(self):
+        return iter(self._ids)
+
+    def raw(self, entity_id):
+        # (entity type, raw parameter text from '(' up to and including ';') without decoding
+        index = bisect_left(self._ids, entity_id)
+        if index == len(self._ids) or self._ids[index] != entity_id:
+            raise KeyError(f'#{entity_id} not found in {self.ifc_path}')
+        offset = self._offsets[index]
+
+        # Entity type sits between '=' and '(' on the same line
+        line_start = self._data.rfind(b'=', 0, offset) + 1
+        entity_type = self._data[line_start:offset].strip().upper().decode('ascii')
+
+        end = offset
+        for match in _END_PATTERN.finditer(self._data, offset):
+            if match.group(0) == b';':
+                end = match.end()
+                break
+        return entity_type, self._data[offset:end]
+
+    def by_id(self, entity_id):
+        entity = self._cache.get(entity_id)
+        if entity is not None:
+            self._cache.move_to_end(entity_id)
+            return entity
+
+        entity_type, raw = self.raw(entity_id)
+        args, _ = parse_arguments(raw)
+
+        entity = StepEntity(entity_id, entity_type, args, self._attribute_names(entity_type))
+        self._cache[entity_id] = entity
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return entity
+
+    def by_type(self, ifc_class, include_subtypes=True):
+        for entity_id in self.ids_by_type(ifc_class, include_subtypes):
+            yield self.by_id(entity_id)
+
+    def reachable(self, entity_ids, max_depth=None):
+        # Ids of all entities referenced (transitively) from entity_ids, decoding only those
+        seen = set(entity_ids)
+        frontier = list(seen)
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            next_frontier = []
+            for entity_id in frontier:
+                for ref in _iter_refs(self.by_id(entity_id).args):
+                    if ref not in seen:
+                        seen.add(ref)
+                        next_frontier.append(ref)
+            frontier = next_frontier
+            depth += 1
+        return seen
+
+    def _decode_property_definition(self, definition):
+        if definition.type == 'IFCPROPERTYSET':
+            properties = []
+            for ref in definition[_PSET_HAS_PROPERTIES] or ():
+                prop = self.by_id(ref.id)
+                if prop.type == 'IFCPROPERTYSINGLEVALUE':
+                    value = prop[2]
+                    properties.append((prop[0], value.value if isinstance(value, TypedValue) else value))
+            is_quantity_set = False
+        elif definition.type == 'IFCELEMENTQUANTITY':
+            properties = []
+            for ref in definition[_QTO_QUANTITIES] or ():
+                quantity = self.by_id(ref.id)
+                if quantity.type in _QUANTITY_TYPES:
+                    properties.append((quantity[0], quantity[3]))
+            is_quantity_set = True
+        else:
+            return None
+        return definition[_PSET_NAME], tuple(properties), is_quantity_set
+
+    def collect_property_sets(self, element_ids):
+        # Same result shape as ifc_to_xlsx.collect_property_sets, restricted to element_ids:
+        # {element id: [(pset name, ((property, value), ...), is quantity set), ...]}, type psets first.
+        wanted = set(element_ids)
+        decoded = {}
+        psets_by_element = defaultdict(list)
+
+        def decode(ref):
+            if ref.id not in decoded:
+                decoded[ref.id] = self._decode_property_definition(self.by_id(ref.id))
+            return decoded[ref.id]
+
+        for rel_type, definitions_of in (
+            ('IFCRELDEFINESBYTYPE', lambda rel: self.by_id(rel[_REL_RELATING].id)[_TYPE_HAS_PROPERTY_SETS] or ()),
+            ('IFCRELDEFINESBYPROPERTIES', lambda rel: _as_tuple(rel[_REL_RELATING])),
+        ):
+            for rel_id in self._ids_by_type.get(rel_type, ()):
+                relation = self.by_id(rel_id)
+                related = [ref.id for ref in relation[_REL_RELATED_OBJECTS] if ref.id in wanted]
+                if not related:
+                    continue
+                psets = [pset for pset in map(decode, definitions_of(relation)) if pset]
+                for element_id in related:
+                    psets_by_element[element_id].extend(psets)
+
+        return psets_by_element
+
+    def extract(self, ifc_classes, with_psets=True):
+        # Rows like ifc_to_xlsx.extract_ifc_data, but only for the requested classes:
+        # {GlobalId: {attribute or property name: value}}
+        element_ids = sorted({entity_id for ifc_class in ifc_classes for entity_id in self.ids_by_type(ifc_class)})
+        psets_by_element = self.collect_property_sets(element_ids) if with_psets else {}
+
+        data_dict = {}
+        for entity_id in element_ids:
+            element = self.by_id(entity_id)
+            names = element._names or [str(index) for index in range(len(element.args))]
+            element_data = {'id': entity_id, 'type': element.type}
+            for name, value in zip(names, element.args):
+                if value is not None:
+                    element_data[name] = _plain_value(value)
+            element_data.update(_property_columns(psets_by_element.get(entity_id, ())))
+            data_dict[element.args[0]] = element_data
+        return data_dict
+
+    def extract_columns(self, ifc_classes, include_subtypes=True, with_psets=True):
+        # Same layout as ifc_to_xlsx.extract_ifc_columns ({column name: list of values}, rows aligned),
+        # decoding only the elements of the requested classes and their property sets
+        element_ids = sorted({
+            entity_id for ifc_class in ifc_classes for entity_id in self.ids_by_type(ifc_class, include_subtypes)
+        })
+        psets_by_element = self.collect_property_sets(element_ids) if with_psets else {}
+        row_count = len(element_ids)
+        columns = {}
+
+        def column(name):
+            values = columns.get(name)
+            if values is None:
+                values = columns[name] = [None] * row_count
+            return values
+
+        guids, step_ids, types = column('Element ID'), column('id'), column('type')
+        attributes_by_type = {}
+        for row, entity_id in enumerate(element_ids):
+            element = self.by_id(entity_id)
+            attributes = attributes_by_type.get(element.type)
+            if attributes is None:
+                names = element._names or [str(index) for index in range(len(element.args))]
+                attributes = attributes_by_type[element.type] = [column(name) for name in names]
+            guids[row] = element.args[0]
+            step_ids[row] = entity_id
+            types[row] = self._class_name(element.type)
+            for values, value in zip(attributes, element.args):
+                if value is not None:
+                    values[row] = _plain_value(value)
+            for name, value in _property_columns(psets_by_element.get(entity_id, ())):
+                column(name)[row] = _plain_value(value)
+        return columns
+
+
+def _as_tuple(value):
+    # Ref and TypedValue are namedtuples themselves, only plain tuples are STEP lists
+    return value if type(value) is tuple else (value,)
+
+
+def _iter_refs(args):
+    for value in args:
+        if isinstance(value, Ref):
+            yield value.id
+        elif isinstance(value, TypedValue):
+            yield from _iter_refs(_as_tuple(value.value))
+        elif isinstance(value, tuple):
+            yield from _iter_refs(value)
+
+
+def _property_columns(psets):
+    # Same naming as ifc_to_xlsx.property_columns: quantities as '<quantity set>.<quantity>'
+    for pset_name, properties, is_quantity_set in psets:
+        for name, value in properties:
+            yield (f'{pset_name}.{name}' if is_quantity_set else name), value
+
+
+def _plain_value(value):
+    if isinstance(value, Ref):
+        return value.id
+    if isinstance(value, TypedValue):
+        return _plain_value(value.value)
+    if isinstance(value, tuple):
+        return str(tuple(_plain_value(item) for item in value))
+    return value
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Extract selected IFC entity types without loading the whole model.')
+    parser.add_argument('ifc_path')
+    parser.add_argument('classes', nargs='+', help='IFC classes, e.g. IfcWall IfcSlab')
+    parser.add_argument('-o', '--output', help='output .xlsx file (prints a summary when omitted)')
+    parser.add_argument('--no-psets', action='store_true', help='skip property and quantity sets')
+    args = parser.parse_args()
+
+    with StreamingIfcReader(args.ifc_path) as reader:
+        data = reader.extract(args.classes, with_psets=not args.no_psets)
+
+    if args.output:
+        from ifc_to_xlsx import create_excel
+
+        create_excel(data, args.output)
+    else:
+        print(f'{len(data)} elements of {", ".join(args.classes)}')
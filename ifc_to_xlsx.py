@@ -1,10 +1,84 @@
+import sys
+from collections import defaultdict
+
 import ifcopenshell
 import pandas as pd
 
 
+def decode_property_definition(definition):
+    # Decode an IfcPropertySet / IfcElementQuantity into (name, ((property name, value), ...), is quantity set).
+    # Returns None for property definitions that carry no single values.
+    if definition.is_a('IfcPropertySet'):
+        properties = [
+            (prop.Name, prop.NominalValue.wrappedValue if prop.NominalValue else None)
+            for prop in definition.HasProperties
+            if prop.is_a('IfcPropertySingleValue')
+        ]
+        is_quantity_set = False
+    elif definition.is_a('IfcElementQuantity'):
+        # IfcQuantityLength/Area/Volume/Count/Weight/Time all keep the value as the fourth attribute
+        properties = [
+            (quantity.Name, quantity[3])
+            for quantity in definition.Quantities
+            if quantity.is_a('IfcPhysicalSimpleQuantity')
+        ]
+        is_quantity_set = True
+    else:
+        return None
+
+    return definition.Name, tuple(properties), is_quantity_set
+
+
+def collect_property_sets(ifc_file):
+    # Walk the relationship entities once instead of an IsDefinedBy inverse lookup per element.
+    # Every property set is decoded only once and the decoded tuple is shared by all related objects.
+    # Returns {element id: [(pset name, properties, is quantity set), ...]} with type psets first,
+    # so occurrence values win.
+    decoded = {}
+
+    def decode(definition):
+        key = definition.id()
+        if key not in decoded:
+            decoded[key] = decode_property_definition(definition)
+        return decoded[key]
+
+    psets_by_element = defaultdict(list)
+
+    for relation in ifc_file.by_type('IfcRelDefinesByType'):
+        type_object = relation.RelatingType
+        type_psets = [pset for pset in map(decode, type_object.HasPropertySets or ()) if pset]
+        if type_psets:
+            for related in relation.RelatedObjects:
+                psets_by_element[related.id()].extend(type_psets)
+
+    for relation in ifc_file.by_type('IfcRelDefinesByProperties'):
+        definitions = relation.RelatingPropertyDefinition
+        # IFC4 allows an IfcPropertySetDefinitionSet (a plain tuple) here
+        if not isinstance(definitions, tuple):
+            definitions = (definitions,)
+        psets = [pset for pset in map(decode, definitions) if pset]
+        if psets:
+            for related in relation.RelatedObjects:
+                psets_by_element[related.id()].extend(psets)
+
+    return psets_by_element
+
+
+def property_columns(psets):
+    # Flatten one element's property sets into (column name, value) pairs. Properties keep their bare name,
+    # later sets override earlier ones (occurrence over type). Quantities are named '<quantity set>.<quantity>',
+    # so a quantity never replaces a property value of the same name.
+    for pset_name, properties, is_quantity_set in psets:
+        for name, value in properties:
+            yield (f'{pset_name}.{name}' if is_quantity_set else name), value
+
+
 def extract_ifc_data(ifc_path):
-    # Load the IFC file
-    ifc_file = ifcopenshell.open(ifc_path)
+    # Load the IFC file (an already opened model is used as is)
+    ifc_file = ifcopenshell.open(ifc_path) if isinstance(ifc_path, str) else ifc_path
+
+    # Property sets, type property sets and quantity sets for all elements, decoded once
+    psets_by_element = collect_property_sets(ifc_file)
 
     # Prepare a dictionary to hold data, keys are element IDs and values are dicts of parameters
     data_dict = {}
@@ -22,15 +96,8 @@ def extract_ifc_data(ifc_path):
             except AttributeError:
                 continue
 
-        # Additional properties from IsDefinedBy relationships
-        for definition in element.IsDefinedBy:
-            if definition.is_a('IfcRelDefinesByProperties'):
-                property_set = definition.RelatingPropertyDefinition
-                if property_set.is_a('IfcPropertySet'):
-                    for property in property_set.HasProperties:
-                        if property.is_a('IfcPropertySingleValue'):
-                            element_data[
-                                property.Name] = property.NominalValue.wrappedValue if property.NominalValue else None
+        # Additional properties from the property relationships
+        element_data.update(property_columns(psets_by_element.get(element.id(), ())))
 
         # Store data in the dictionary
         data_dict[element.GlobalId] = element_data
@@ -38,22 +105,125 @@ def extract_ifc_data(ifc_path):
     return data_dict
 
 
-def create_excel(data_dict, output_path):
-    # Convert the dictionary to a DataFrame
-    df = pd.DataFrame.from_dict(data_dict, orient='index')
+def plain_value(value):
+    # Entity references become step ids, wrapped select values their plain value, strings are interned
+    if isinstance(value, ifcopenshell.entity_instance):
+        return value.id() or plain_value(value.wrappedValue)
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, tuple):
+        return sys.intern(str(tuple(plain_value(item) for item in value)))
+    return value
+
+
+def attribute_names(ifc_file, ifc_type):
+    # Attribute names of an IFC class in schema order, read from the schema declaration
+    # (entity instances no longer expose wrapped_data.get_attribute_names() in ifcopenshell 0.9)
+    declaration = ifcopenshell.ifcopenshell_wrapper.schema_by_name(ifc_file.schema).declaration_by_name(ifc_type)
+    return tuple(attribute.name() for attribute in declaration.all_attributes())
+
+
+def extract_ifc_columns(ifc_file, ifc_class='IfcProduct', include_subtypes=True, psets_by_element=None):
+    # Columnar variant of extract_ifc_data: values go straight into one list per column,
+    # with the attribute columns resolved once per IFC class instead of a dict per element.
+    # Returns {column name: list of values}, all lists aligned by row.
+    elements = ifc_file.by_type(ifc_class, include_subtypes)
+    row_count = len(elements)
+    if psets_by_element is None:
+        psets_by_element = collect_property_sets(ifc_file)
+
+    columns = {}
 
-    # Ensure the GlobalId is the first column
-    df.reset_index(inplace=True)
-    df.rename(columns={'index': 'Element ID'}, inplace=True)
+    def column(name):
+        values = columns.get(name)
+        if values is None:
+            values = columns[name] = [None] * row_count
+        return values
+
+    element_ids, step_ids, types = column('Element ID'), column('id'), column('type')
+    attributes_by_class = {}
+
+    for row, element in enumerate(elements):
+        ifc_type = element.is_a()
+        attributes = attributes_by_class.get(ifc_type)
+        if attributes is None:
+            names = attribute_names(ifc_file, ifc_type)
+            attributes = attributes_by_class[ifc_type] = [(index, column(name)) for index, name in enumerate(names)]
+
+        element_ids[row] = element.GlobalId
+        step_ids[row] = element.id()
+        types[row] = sys.intern(ifc_type)
+
+        for index, values in attributes:
+            value = element[index]
+            if value is not None:
+                values[row] = plain_value(value)
+
+        for name, value in property_columns(psets_by_element.get(element.id(), ())):
+            column(name)[row] = plain_value(value)
+
+    return columns
+
+
+def _typed_column(values):
+    kinds = {type(value) for value in values if value is not None}
+    if kinds == {bool}:
+        return pd.array(values, dtype='boolean')
+    if kinds == {int}:
+        return pd.array(values, dtype='Int64')
+    if kinds and kinds <= {int, float}:
+        return pd.array(values, dtype='Float64')
+    if kinds == {str}:
+        return pd.array(values, dtype='string')
+    return pd.array(values, dtype=object)
+
+
+def columns_to_dataframe(columns):
+    # Build the DataFrame column by column with a concrete dtype instead of object for everything
+    return pd.DataFrame({name: _typed_column(values) for name, values in columns.items()}, copy=False)
+
+
+def columns_to_arrow(columns):
+    import pyarrow as pa
+
+    arrays = {}
+    for name, values in columns.items():
+        try:
+            arrays[name] = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed value types in one column (e.g. a property that is text in one pset and numeric in another)
+            arrays[name] = pa.array([None if value is None else str(value) for value in values], type=pa.string())
+    return pa.table(arrays)
+
+
+def create_excel(data, output_path):
+    if isinstance(data, pd.DataFrame):
+        df = data
+    else:
+        # Convert the dictionary to a DataFrame
+        df = pd.DataFrame.from_dict(data, orient='index')
+
+        # Ensure the GlobalId is the first column
+        df.reset_index(inplace=True)
+        df.rename(columns={'index': 'Element ID'}, inplace=True)
 
     # Save the DataFrame to an Excel file
     df.to_excel(output_path, index=False)
 
 
-# Specify the path to your IFC file and the desired output Excel file path
-ifc_path = r'C:\Users\dvjak\Documents\GitHub\Utilities\AC20-FZK-Haus.ifc'
-output_excel_path = r'C:\Users\dvjak\Documents\GitHub\Utilities\AC20-FZK-Haus.xlsx'
+if __name__ == '__main__':
+    # Specify the path to your IFC file and the desired output Excel file path
+    ifc_path = r'C:\Users\dvjak\Documents\GitHub\Utilities\AC20-FZK-Haus.ifc'
+    output_excel_path = r'C:\Users\dvjak\Documents\GitHub\Utilities\AC20-FZK-Haus.xlsx'
+
+    # Extract data column by column and create the Excel file
+    ifc_file = ifcopenshell.open(ifc_path)
+    data = columns_to_dataframe(extract_ifc_columns(ifc_file))
+
+    # Optional geometry quantity takeoff (volume, area, footprint, bounding box) as extra columns
+    if '--quantities' in sys.argv:
+        from ifc_quantities import compute_quantities, merge_quantities
+
+        data = merge_quantities(data, compute_quantities(ifc_file))
 
-# Extract data and create the Excel file
-data = extract_ifc_data(ifc_path)
-create_excel(data, output_excel_path)
+    create_excel(data, output_excel_path)
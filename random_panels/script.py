@@ -2,6 +2,7 @@ import streamlit as st
 import matplotlib.pyplot as plt
 import numpy as np
 import math
+import time
 from io import BytesIO
 import pandas as pd
 
@@ -68,8 +69,25 @@ def capacity_check(canvas_w, canvas_h, specs, gap):
 # =========================
 #  Generování kruhů s prostorovým indexem
 # =========================
-def generate_circles_fast(canvas_w, canvas_h, circle_specs, gap, max_attempts_per_circle, rng):
-    """Vrací: rows (list[dict]) – jen data; vykreslení děláme zvlášť."""
+def attempt_budget(canvas_w, canvas_h, radius, max_attempts_per_circle):
+    """Počet neúspěšných pokusů v řadě, po kterém se umisťování kruhů daného poloměru vzdá (roste s plochou plátna)."""
+    return max_attempts_per_circle + int((canvas_w * canvas_h) / (math.pi * radius * radius) * 0.5)
+
+
+def report_shortfall(rows, circle_specs, note=""):
+    """Varování pro každý typ kruhů, kterých se umístilo méně, než bylo požadováno."""
+    placed_by_label = pd.Series([row["Type"] for row in rows], dtype=object).value_counts().to_dict()
+    for _, _, count, label in circle_specs:
+        placed = placed_by_label.get(label.capitalize(), 0)
+        if placed < count:
+            st.warning(f"Nepodařilo se umístit {count - placed} z {count} „{label}“ (hustota/hledání){note}.")
+
+
+def generate_circles_fast(canvas_w, canvas_h, circle_specs, gap, max_attempts_per_circle, rng, warn_shortfall=True):
+    """
+    Vrací: rows (list[dict]) – jen data; vykreslení děláme zvlášť.
+    warn_shortfall=False potlačí varování o neumístěných kruzích (např. když po generování následuje relaxace).
+    """
     req_area, cap_area = capacity_check(canvas_w, canvas_h, circle_specs, gap)
     if cap_area > 0 and req_area > cap_area:
         ratio = 100.0 * req_area / cap_area
@@ -87,7 +105,7 @@ def generate_circles_fast(canvas_w, canvas_h, circle_specs, gap, max_attempts_pe
     for color, radius, count, label in circle_specs:
         placed = 0
         attempts = 0
-        local_max_attempts = max_attempts_per_circle + int((canvas_w * canvas_h) / (math.pi * radius * radius) * 0.5)
+        local_max_attempts = attempt_budget(canvas_w, canvas_h, radius, max_attempts_per_circle)
 
         while placed < count and attempts < local_max_attempts:
             x = int(rng.integers(radius, canvas_w - radius + 1))
@@ -110,12 +128,186 @@ def generate_circles_fast(canvas_w, canvas_h, circle_specs, gap, max_attempts_pe
             else:
                 attempts += 1
 
-        if placed < count:
-            st.warning(f"Nepodařilo se umístit {count - placed} z {count} „{label}“ (hustota/hledání).")
-
+    if warn_shortfall:
+        report_shortfall(rows, circle_specs)
     return rows
 
 
+# =========================
+#  Relaxace rozložení (vektorově přes numpy) + dosazení dalších kruhů
+# =========================
+def neighbor_pairs(x, y, cell: float, span: int):
+    """
+    Kandidátní dvojice (i < j) ze stejné hash mřížky jako SpatialIndex, ale vektorově:
+    pro každý posun (±span buněk) se sousedé najdou přes searchsorted v seřazených klíčích buněk.
+    """
+    n = len(x)
+    if n < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    cx = np.floor(x / cell).astype(np.int64)
+    cy = np.floor(y / cell).astype(np.int64) + span + 1
+    stride = int(cy.max()) + span + 2
+    keys = cx * stride + cy
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    src_parts, dst_parts = [], []
+    for dx in range(-span, span + 1):
+        for dy in range(-span, span + 1):
+            target = keys + dx * stride + dy
+            lo = np.searchsorted(sorted_keys, target, side="left")
+            hi = np.searchsorted(sorted_keys, target, side="right")
+            counts = hi - lo
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            src = np.repeat(np.arange(n), counts)
+            within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            dst = order[np.repeat(lo, counts) + within]
+            mask = src < dst
+            src_parts.append(src[mask])
+            dst_parts.append(dst[mask])
+
+    if not src_parts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(src_parts), np.concatenate(dst_parts)
+
+
+def overlapping(x, y, r, gap, cell, span):
+    """Maska kruhů, které porušují minimální mezeru 'gap' (celočíselně, stejně jako SpatialIndex.overlaps)."""
+    i, j = neighbor_pairs(x, y, cell, span)
+    lim = r[i] + r[j] + gap
+    bad = (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 < lim * lim
+    mask = np.zeros(len(x), dtype=bool)
+    mask[i[bad]] = True
+    mask[j[bad]] = True
+    return mask
+
+
+def relax_step(x, y, r, canvas_w, canvas_h, gap, spread, cell, span):
+    """
+    Jeden krok odpuzování: dvojice blíž než (r_i + r_j + gap) * (1 + spread) se od sebe odtlačí,
+    pohyb je omezen plátnem. Kruhy, které by po posunu kolidovaly, se vrátí na původní místo,
+    takže rozložení zůstává vždy platné.
+    """
+    i, j = neighbor_pairs(x, y, cell, span)
+    dx = (x[j] - x[i]).astype(np.float64)
+    dy = (y[j] - y[i]).astype(np.float64)
+    dist = np.maximum(np.hypot(dx, dy), 1e-9)
+    target = (r[i] + r[j] + gap) * (1.0 + spread)
+    push = np.clip(target - dist, 0.0, None) * 0.5
+    ux, uy = dx / dist, dy / dist
+
+    fx = np.zeros(len(x))
+    fy = np.zeros(len(x))
+    np.add.at(fx, i, -push * ux)
+    np.add.at(fy, i, -push * uy)
+    np.add.at(fx, j, push * ux)
+    np.add.at(fy, j, push * uy)
+
+    # omezení délky kroku na poloměr, aby kruhy "nepřeskakovaly" sousedy
+    length = np.maximum(np.hypot(fx, fy), 1e-9)
+    scale = np.minimum(1.0, r / length)
+    nx = np.clip(np.rint(x + fx * scale), r, canvas_w - r).astype(np.int64)
+    ny = np.clip(np.rint(y + fy * scale), r, canvas_h - r).astype(np.int64)
+
+    # vracení kolidujících kruhů, dokud nejsou všechny kolize odstraněny
+    while True:
+        bad = overlapping(nx, ny, r, gap, cell, span) & ((nx != x) | (ny != y))
+        if not bad.any():
+            break
+        nx[bad] = x[bad]
+        ny[bad] = y[bad]
+    moved = int(np.count_nonzero((nx != x) | (ny != y)))
+    return nx, ny, moved
+
+
+def relax_and_fill(rows, canvas_w, canvas_h, circle_specs, gap, iterations, rng,
+                   max_attempts_per_circle, spread=0.25):
+    """
+    Volitelná relaxace po generate_circles_fast: střídá krok odpuzování a pokus o vložení
+    dosud neumístěných kruhů do uvolněného místa (se stejným rozpočtem pokusů jako generování).
+    Vrací: (rows, stats) – stats je seznam řádků s pokrytím a časem pro každou iteraci.
+    """
+    if not rows:
+        return rows, []
+
+    x = np.array([row["X"] for row in rows], dtype=np.int64)
+    y = np.array([row["Y"] for row in rows], dtype=np.int64)
+    r = np.array([row["Radius"] for row in rows], dtype=np.int64)
+    max_r = max((radius for _, radius, _, _ in circle_specs), default=1)
+    cell = float(max(1, max_r + gap))
+    # dosah odpuzování je (2*max_r + gap) * (1 + spread) → tolik buněk okolí
+    span = max(2, int(math.ceil((2 * max_r + gap) * (1.0 + spread) / cell)))
+    canvas_area = max(1.0, float(canvas_w * canvas_h))
+
+    placed_by_label = pd.Series([row["Type"] for row in rows]).value_counts().to_dict()
+    missing = {label: count - placed_by_label.get(label.capitalize(), 0)
+               for _, _, count, label in circle_specs}
+    coverage = float(np.pi * np.sum(r.astype(np.float64) ** 2)) / canvas_area * 100.0
+
+    stats = []
+    for iteration in range(1, int(iterations) + 1):
+        started = time.perf_counter()
+        x, y, moved = relax_step(x, y, r, canvas_w, canvas_h, gap, spread, cell, span)
+
+        # dosazení chybějících kruhů (od největších) do uvolněného místa
+        si = SpatialIndex(cell_size=int(cell), neighbor_span=2)
+        for px, py, pr in zip(x.tolist(), y.tolist(), r.tolist()):
+            si.add(px, py, pr)
+        added = 0
+        new_x, new_y, new_r = [], [], []
+        for color, radius, count, label in sorted(circle_specs, key=lambda t: t[1], reverse=True):
+            attempts = 0
+            fill_attempts = attempt_budget(canvas_w, canvas_h, radius, max_attempts_per_circle)
+            while missing[label] > 0 and attempts < fill_attempts:
+                px = int(rng.integers(radius, canvas_w - radius + 1))
+                py = int(rng.integers(radius, canvas_h - radius + 1))
+                if not si.overlaps(px, py, radius, gap):
+                    si.add(px, py, radius)
+                    new_x.append(px)
+                    new_y.append(py)
+                    new_r.append(radius)
+                    rows.append({
+                        "ID": len(rows) + 1,
+                        "Type": label.capitalize(),
+                        "Color": color,
+                        "X": px,
+                        "Y": py,
+                        "Radius": int(radius),
+                        "Canvas Width": int(canvas_w),
+                        "Canvas Height": int(canvas_h),
+                        "Gap Between Circles": int(gap),
+                    })
+                    missing[label] -= 1
+                    added += 1
+                    attempts = 0
+                else:
+                    attempts += 1
+        if new_x:
+            x = np.concatenate([x, np.array(new_x, dtype=np.int64)])
+            y = np.concatenate([y, np.array(new_y, dtype=np.int64)])
+            r = np.concatenate([r, np.array(new_r, dtype=np.int64)])
+
+        new_coverage = float(np.pi * np.sum(r.astype(np.float64) ** 2)) / canvas_area * 100.0
+        stats.append({
+            "Iterace": iteration,
+            "Posunuto kruhů": moved,
+            "Přidáno kruhů": added,
+            "Pokrytí [%]": round(new_coverage, 3),
+            "Přírůstek [%]": round(new_coverage - coverage, 3),
+            "Čas [ms]": round((time.perf_counter() - started) * 1000.0, 1),
+        })
+        coverage = new_coverage
+
+    for row, px, py in zip(rows, x.tolist(), y.tolist()):
+        row["X"] = int(px)
+        row["Y"] = int(py)
+    return rows, stats
+
+
 # =========================
 #  Vykreslení do PNG (barvy / černobíle)
 # =========================
@@ -183,6 +375,12 @@ def main():
         num_green_circles = st.slider("Počet zelených kruhů", 0, 1500, 50)
         green_circle_radius = st.slider("Poloměr zelených kruhů", 1, 100, 5)
 
+        st.header("Relaxace")
+        use_relaxation = st.checkbox("Relaxace a zahuštění po umístění", value=False,
+                                     help="Odtlačí kruhy od sebe a do uvolněného místa vloží ty, které se nevešly.")
+        relax_iterations = st.slider("Počet iterací relaxace", 1, 50, 10)
+        relax_spread = st.slider("Síla rozestupu", 0.0, 1.0, 0.25, step=0.05)
+
         submitted = st.form_submit_button("Generovat")
 
     # Session state
@@ -190,6 +388,8 @@ def main():
         st.session_state["rows"] = None
     if "image_bytes" not in st.session_state:
         st.session_state["image_bytes"] = None
+    if "relax_stats" not in st.session_state:
+        st.session_state["relax_stats"] = None
 
     # Po kliknutí na Generovat vygeneruj NOVÉ souřadnice
     if submitted:
@@ -202,9 +402,19 @@ def main():
         rows = generate_circles_fast(
             int(canvas_width), int(canvas_height),
             circle_specs, int(gap_between_circles),
-            int(max_attempts_per_circle), rng
+            int(max_attempts_per_circle), rng, warn_shortfall=not use_relaxation
         )
+        relax_stats = None
+        if use_relaxation:
+            rows, relax_stats = relax_and_fill(
+                rows, int(canvas_width), int(canvas_height), circle_specs,
+                int(gap_between_circles), int(relax_iterations), rng,
+                int(max_attempts_per_circle), spread=float(relax_spread)
+            )
+            # varuje až podle výsledku relaxace, která část chybějících kruhů dosadí
+            report_shortfall(rows, circle_specs, note=" ani po relaxaci")
         st.session_state["rows"] = rows
+        st.session_state["relax_stats"] = relax_stats
         # ihned vyrenderuj s aktuálním bw_mode
         st.session_state["image_bytes"] = render_png(rows, int(canvas_width), int(canvas_height), int(png_dpi), bw_mode)
 
@@ -225,6 +435,15 @@ def main():
         st.write(f"### Poměr děrování (pokrytí): {ratio_percentage:.2f}%")
         st.caption("Počítáno ze skutečně umístěných kruhů.")
 
+        if st.session_state["relax_stats"]:
+            relax_df = pd.DataFrame(st.session_state["relax_stats"])
+            st.write("### Relaxace")
+            st.caption(
+                f"Přírůstek pokrytí celkem {relax_df['Přírůstek [%]'].sum():.2f} % "
+                f"za {relax_df['Čas [ms]'].sum():.0f} ms."
+            )
+            st.dataframe(relax_df, hide_index=True)
+
         counts = df["Type"].value_counts().to_dict()
         st.write("**Počty umístěných kruhů:** " +
                  ", ".join([f"{k}: {v}" for k, v in counts.items()]) +
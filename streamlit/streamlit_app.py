@@ -37,67 +37,110 @@ import streamlit as st
 # tab1, tab2 = st.tabs(["Tab 1", "Tab2"])
 # tab1.write("this is tab 1")
 # tab2.write("this is tab 2")
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
 import streamlit as st
 
-# Conversion functions
-def convert_length(value, from_unit, to_unit):
-    conversion_factors = {
-        'meters': 1,
-        'feet': 3.28084,
-        'inches': 39.3701,
-        'kilometers': 0.001,
-        'miles': 0.000621371
-    }
-    return value * conversion_factors[from_unit] / conversion_factors[to_unit]
+from unit_registry import registry
+
+# Units offered per conversion type; any unit the registry can parse works in "Custom"
+UNITS = {
+    "Length": ["meters", "feet", "inches", "kilometers", "miles"],
+    "Weight": ["kilograms", "grams", "pounds", "ounces"],
+    "Temperature": ["Celsius", "Fahrenheit", "Kelvin"],
+    "Area": ["m²", "cm²", "ft²", "in²", "ha"],
+    "Volume": ["m³", "l", "cm³", "ft³"],
+    "Density": ["kg/m³", "g/cm³", "t/m³", "lb/ft³"],
+    "Line load": ["kN/m", "N/mm", "lbf/ft"],
+    "Pressure": ["kPa", "MPa", "N/mm²", "kN/m²"],
+}
+
+def convert_array(values, from_unit, to_unit):
+    # One affine transform over the whole array (NaN stays NaN); the factors come from the registry LRU
+    a, b = registry.conversion(from_unit, to_unit)
+    result = np.multiply(values, a)
+    result += b
+    return result
 
-def convert_weight(value, from_unit, to_unit):
-    conversion_factors = {
-        'kilograms': 1,
-        'grams': 0.001, # 1 gram = 0.001 kilograms
-        'pounds': 0.453592, # 1 pound = 0.453592 kilograms
-        'ounces': 0.0283495 # 1 ounce = 0.0283495 kilograms
-    }
-    value_in_kg = value * conversion_factors[from_unit]
-    return value_in_kg / conversion_factors[to_unit]
+@st.cache_data
+def read_table(file_bytes, file_name):
+    if file_name.lower().endswith(".xlsx"):
+        return pd.read_excel(BytesIO(file_bytes))
+    return pd.read_csv(BytesIO(file_bytes), sep=None, engine="python")
 
-def convert_temperature(value, from_unit, to_unit):
-    if from_unit == 'Celsius' and to_unit == 'Fahrenheit':
-        return value * 9/5 + 32
-    elif from_unit == 'Fahrenheit' and to_unit == 'Celsius':
-        return (value - 32) * 5/9
-    elif from_unit == 'Celsius' and to_unit == 'Kelvin':
-        return value + 273.15
-    elif from_unit == 'Kelvin' and to_unit == 'Celsius':
-        return value - 273.15
-    elif from_unit == 'Fahrenheit' and to_unit == 'Kelvin':
-        return (value - 32) * 5/9 + 273.15
-    elif from_unit == 'Kelvin' and to_unit == 'Fahrenheit':
-        return (value - 273.15) * 9/5 + 32
+@st.cache_data(max_entries=4)
+def convert_table(file_bytes, file_name, conversions, replace_columns):
+    # conversions: ((columns, from_unit, to_unit), ...). Cached on the inputs, so reruns caused by other
+    # widgets reuse the converted table and the CSV bytes instead of rebuilding them.
+    df = read_table(file_bytes, file_name).copy()
+    started = time.perf_counter()
+    for columns, from_unit, to_unit in conversions:
+        for column in columns:
+            values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+            target = column if replace_columns else f"{column} [{to_unit}]"
+            df[target] = convert_array(values, from_unit, to_unit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return df, df.to_csv(index=False).encode("utf-8"), elapsed_ms
+
+def select_units(key=""):
+    conversion_type = st.selectbox("Select conversion type:", [*UNITS, "Custom"], key=f"{key}type")
+    if conversion_type == "Custom":
+        from_unit = st.text_input("From unit:", "kN/m", key=f"{key}from")
+        to_unit = st.text_input("To unit:", "N/mm", key=f"{key}to")
     else:
-        return value
+        from_unit = st.selectbox("From unit:", UNITS[conversion_type], key=f"{key}from")
+        to_unit = st.selectbox("To unit:", UNITS[conversion_type], key=f"{key}to")
+    try:
+        registry.conversion(from_unit, to_unit)
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+    return from_unit, to_unit
 
 # Streamlit app
 st.title("Unit Converter")
 
-conversion_type = st.selectbox("Select conversion type:", ["Length", "Weight", "Temperature"])
+mode = st.radio("Mode:", ["Single value", "Bulk (CSV/XLSX)"], horizontal=True)
 
-if conversion_type == "Length":
+if mode == "Single value":
+    from_unit, to_unit = select_units()
     value = st.number_input("Enter the value:")
-    from_unit = st.selectbox("From unit:", ["meters", "feet", "inches", "kilometers", "miles"])
-    to_unit = st.selectbox("To unit:", ["meters", "feet", "inches", "kilometers", "miles"])
-    result = convert_length(value, from_unit, to_unit)
+    result = registry.convert(value, from_unit, to_unit)
     st.write(f"{value} {from_unit} is equal to {result:.2f} {to_unit}")
 
-elif conversion_type == "Weight":
-    value = st.number_input("Enter the value:")
-    from_unit = st.selectbox("From unit:", ["kilograms", "grams", "pounds", "ounces"])
-    to_unit = st.selectbox("To unit:", ["kilograms", "grams", "pounds", "ounces"])
-    result = convert_weight(value, from_unit, to_unit)
-    st.write(f"{value} {from_unit} is equal to {result:.2f} {to_unit}")
+else:
+    uploaded = st.file_uploader("Upload CSV or XLSX", type=["csv", "xlsx"])
+    if uploaded is not None:
+        file_bytes = uploaded.getvalue()
+        df = read_table(file_bytes, uploaded.name)
 
-elif conversion_type == "Temperature":
-    value = st.number_input("Enter the value:")
-    from_unit = st.selectbox("From unit:", ["Celsius", "Fahrenheit", "Kelvin"])
-    to_unit = st.selectbox("To unit:", ["Celsius", "Fahrenheit", "Kelvin"])
-    result = convert_temperature(value, from_unit, to_unit)
-    st.write(f"{value} {from_unit} is equal to {result:.2f} {to_unit}")
+        # Survey and BoQ tables mix lengths, weights, loads...: every group has its own columns and units.
+        # No column is preselected, so IDs and counts are never converted by accident.
+        group_count = st.number_input("Number of conversion groups:", min_value=1, max_value=10, value=1)
+        conversions, taken = [], set()
+        for group in range(int(group_count)):
+            st.subheader(f"Group {group + 1}")
+            columns = st.multiselect("Columns to convert:", list(df.columns), default=[], key=f"group{group}columns")
+            from_unit, to_unit = select_units(key=f"group{group}")
+            if taken.intersection(columns):
+                st.error(f"Columns in more than one group: {', '.join(map(str, taken.intersection(columns)))}")
+                st.stop()
+            taken.update(columns)
+            if columns:
+                conversions.append((tuple(columns), from_unit, to_unit))
+        replace_columns = st.checkbox("Replace original columns", value=False)
+
+        df, csv_bytes, elapsed_ms = convert_table(file_bytes, uploaded.name, tuple(conversions), replace_columns)
+        converted = sum(len(columns) for columns, _, _ in conversions)
+        st.caption(f"Converted {converted} column(s) × {len(df):,} rows in {elapsed_ms:.1f} ms")
+
+        st.dataframe(df.head(100))
+        st.download_button(
+            label="Download CSV",
+            data=csv_bytes,
+            file_name=f"{uploaded.name.rsplit('.', 1)[0]}_converted.csv",
+            mime="text/csv",
+        )
@@ -0,0 +1,166 @@
+import re
+from functools import lru_cache
+
+# Base dimensions: length, mass, time, temperature
+BASE_UNITS = {"m": 0, "kg": 1, "s": 2, "K": 3}
+
+# Conversion graph: (unit, factor, expression) means 1 unit = factor * expression.
+# Expressions may be compound, so derived units are resolved through the graph down to base units.
+DEFINITIONS = [
+    ("mm", 0.1, "cm"),
+    ("cm", 0.01, "m"),
+    ("dm", 0.1, "m"),
+    ("km", 1000.0, "m"),
+    ("in", 0.0254, "m"),
+    ("ft", 12.0, "in"),
+    ("yd", 3.0, "ft"),
+    ("mi", 1760.0, "yd"),
+    ("g", 0.001, "kg"),
+    ("t", 1000.0, "kg"),
+    ("lb", 0.45359237, "kg"),
+    ("oz", 1 / 16, "lb"),
+    ("min", 60.0, "s"),
+    ("h", 60.0, "min"),
+    ("N", 1.0, "kg*m/s^2"),
+    ("kN", 1000.0, "N"),
+    ("MN", 1000.0, "kN"),
+    ("lbf", 4.4482216152605, "N"),
+    ("Pa", 1.0, "N/m^2"),
+    ("kPa", 1000.0, "Pa"),
+    ("MPa", 1000.0, "kPa"),
+    ("J", 1.0, "N*m"),
+    ("kJ", 1000.0, "J"),
+    ("W", 1.0, "J/s"),
+    ("kW", 1000.0, "W"),
+    ("l", 1.0, "dm^3"),
+    ("ha", 10000.0, "m^2"),
+]
+
+# Units with an offset (temperatures), only usable on their own:
+# unit -> (reference unit, (scale, offset) to the reference, (scale, offset) from the reference),
+# value_in_reference = value * scale + offset. Both directions are given exactly, so converting
+# within a family (°C <-> °F) never round-trips through kelvin.
+AFFINE_UNITS = {
+    "degC": ("K", (1.0, 273.15), (1.0, -273.15)),
+    "degF": ("degC", (5 / 9, -160 / 9), (1.8, 32.0)),
+}
+
+ALIASES = {
+    "meters": "m", "feet": "ft", "inches": "in", "kilometers": "km", "miles": "mi",
+    "kilograms": "kg", "grams": "g", "pounds": "lb", "ounces": "oz",
+    "Celsius": "degC", "°C": "degC", "Fahrenheit": "degF", "°F": "degF", "Kelvin": "K",
+    "L": "l", "ton": "t",
+}
+
+_SUPERSCRIPTS = str.maketrans({"²": "^2", "³": "^3", "⁴": "^4", "⁻": "^-", "¹": "1", "·": "*", "×": "*"})
+_TOKEN_PATTERN = re.compile(r"\s*([*/])?\s*([A-Za-z°]+)\s*(?:\^?\s*(-?\d+))?")
+
+
+class UnitRegistry:
+    def __init__(self, definitions=DEFINITIONS, affine_units=AFFINE_UNITS, aliases=ALIASES):
+        self._edges = {unit: (factor, expression) for unit, factor, expression in definitions}
+        self._affine = dict(affine_units)
+        self._aliases = dict(aliases)
+        self._resolving = set()
+        # Each registry gets its own caches, so a custom registry never sees another one's results
+        self._simple = lru_cache(maxsize=None)(self._resolve_simple)
+        self.parse = lru_cache(maxsize=1024)(self._parse)
+        self.conversion = lru_cache(maxsize=4096)(self._conversion)
+
+    def units(self):
+        return sorted([*BASE_UNITS, *self._edges, *self._affine])
+
+    def _resolve_simple(self, unit):
+        # Follow the definition edges down to base units: (factor, dimension exponents).
+        # Results are memoised, so every edge of the graph is walked once per registry.
+        if unit in BASE_UNITS:
+            dimensions = [0] * len(BASE_UNITS)
+            dimensions[BASE_UNITS[unit]] = 1
+            return 1.0, tuple(dimensions)
+        if unit not in self._edges:
+            raise ValueError(f"Unknown unit: {unit}")
+        if unit in self._resolving:
+            raise ValueError(f"Circular unit definition: {unit}")
+
+        self._resolving.add(unit)
+        try:
+            edge_factor, expression = self._edges[unit]
+            expression_factor, dimensions = self._parse(expression)
+        finally:
+            self._resolving.discard(unit)
+        return edge_factor * expression_factor, dimensions
+
+    def _parse(self, text):
+        # 'kg/m³', 'kN/m', 'kN·m', 'm2', 'm/s^2' -> (factor to base units, dimension exponents)
+        text = self._aliases.get(text.strip(), text.strip()).translate(_SUPERSCRIPTS)
+        factor, dimensions = 1.0, [0] * len(BASE_UNITS)
+        position, denominator = 0, False
+        while position < len(text):
+            match = _TOKEN_PATTERN.match(text, position)
+            if not match or match.end() == position:
+                raise ValueError(f"Cannot parse unit: {text}")
+            operator, name, exponent = match.groups()
+            if operator == "/":
+                denominator = True
+            elif operator == "*":
+                denominator = False
+            name = self._aliases.get(name, name)
+            if name in self._affine:
+                raise ValueError(f"{name} has an offset and cannot be part of a compound unit")
+            power = int(exponent) if exponent else 1
+            if denominator:
+                power = -power
+            unit_factor, unit_dimensions = self._simple(name)
+            factor *= unit_factor ** power
+            dimensions = [total + power * value for total, value in zip(dimensions, unit_dimensions)]
+            position = match.end()
+        return factor, tuple(dimensions)
+
+    def _affine_path(self, unit):
+        # [unit, reference, reference of the reference, ...] up to the first unit without an offset
+        path = [unit]
+        while path[-1] in self._affine:
+            path.append(self._affine[path[-1]][0])
+        return path
+
+    def _affine_to_base(self, unit):
+        unit = self._aliases.get(unit.strip(), unit.strip())
+        scale, offset = 1.0, 0.0
+        path = self._affine_path(unit)
+        for step in path[:-1]:
+            step_scale, step_offset = self._affine[step][1]
+            scale, offset = scale * step_scale, offset * step_scale + step_offset
+        factor, dimensions = self.parse(path[-1])
+        return scale * factor, offset * factor, dimensions
+
+    def _conversion(self, from_unit, to_unit):
+        # (a, b) such that value_in_to_unit = value_in_from_unit * a + b
+        from_unit = self._aliases.get(from_unit.strip(), from_unit.strip())
+        to_unit = self._aliases.get(to_unit.strip(), to_unit.strip())
+        if from_unit in self._affine or to_unit in self._affine:
+            # Offset units: go up to the nearest common reference and back down along the exact edges
+            from_path, to_path = self._affine_path(from_unit), self._affine_path(to_unit)
+            common = next((unit for unit in from_path if unit in to_path), None)
+            if common is not None:
+                a, b = 1.0, 0.0
+                for step in from_path[:from_path.index(common)]:
+                    scale, offset = self._affine[step][1]
+                    a, b = a * scale, b * scale + offset
+                for step in reversed(to_path[:to_path.index(common)]):
+                    scale, offset = self._affine[step][2]
+                    a, b = a * scale, b * scale + offset
+                return a, b
+
+        from_scale, from_offset, from_dimensions = self._affine_to_base(from_unit)
+        to_scale, to_offset, to_dimensions = self._affine_to_base(to_unit)
+        if from_dimensions != to_dimensions:
+            raise ValueError(f"Cannot convert {from_unit} to {to_unit}: different dimensions")
+        return from_scale / to_scale, (from_offset - to_offset) / to_scale
+
+    def convert(self, value, from_unit, to_unit):
+        # Works for plain numbers as well as NumPy arrays
+        a, b = self.conversion(from_unit, to_unit)
+        return value * a + b
+
+
+registry = UnitRegistry()
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+pytest.importorskip('ifcopenshell')
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyarrow')
+
+from ifc_batch import convert_batch  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'AC20-FZK-Haus.ifc')
+
+
+def test_split_output_equals_unsplit(tmp_path):
+    whole_dir, split_dir = str(tmp_path / 'whole'), str(tmp_path / 'split')
+    convert_batch([SAMPLE], whole_dir, workers=3)
+    convert_batch([SAMPLE], split_dir, workers=3, split_threshold_mb=0)
+
+    whole = pd.read_parquet(os.path.join(whole_dir, 'AC20-FZK-Haus.parquet'))
+    split = pd.read_parquet(os.path.join(split_dir, 'AC20-FZK-Haus.parquet'))
+
+    # Column order follows the order classes are read in, everything else must match
+    assert sorted(whole.columns) == sorted(split.columns)
+    pd.testing.assert_frame_equal(whole, split[whole.columns])
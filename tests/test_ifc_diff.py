@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+ifcopenshell = pytest.importorskip('ifcopenshell')
+
+from ifc_diff import diff_models  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'AC20-FZK-Haus.ifc')
+WALL_GUID = '2XPyKWY018sA1ygZKgQPtU'
+
+
+def test_moved_element_is_modified(tmp_path):
+    model = ifcopenshell.open(SAMPLE)
+    wall = model.by_guid(WALL_GUID)
+    # New placement entities, so nothing shared with other elements is touched
+    placement = wall.ObjectPlacement
+    relative = placement.RelativePlacement
+    x, y, z = relative.Location.Coordinates
+    moved = model.createIfcLocalPlacement(
+        placement.PlacementRelTo,
+        model.createIfcAxis2Placement3D(
+            model.createIfcCartesianPoint((x + 5.0, y, z)), relative.Axis, relative.RefDirection),
+    )
+    wall.ObjectPlacement = moved
+    moved_path = str(tmp_path / 'moved.ifc')
+    model.write(moved_path)
+
+    added, removed, changes = diff_models(SAMPLE, moved_path)
+
+    assert added.empty and removed.empty
+    assert changes['GlobalId'].unique().tolist() == [WALL_GUID]
+    assert changes['Field'].tolist() == ['ObjectPlacement']
+
+
+def test_unchanged_copy_has_no_changes(tmp_path):
+    copy_path = str(tmp_path / 'copy.ifc')
+    ifcopenshell.open(SAMPLE).write(copy_path)
+
+    added, removed, changes = diff_models(SAMPLE, copy_path)
+
+    assert added.empty and removed.empty and changes.empty
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+ifcopenshell = pytest.importorskip('ifcopenshell')
+import ifcopenshell.api  # noqa: E402
+
+from ifc_query import ModelQueryIndex  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'AC20-FZK-Haus.ifc')
+
+
+def _add_pset(ifc_file, product, name, properties):
+    pset = ifcopenshell.api.run('pset.add_pset', ifc_file, product=product, name=name)
+    ifcopenshell.api.run('pset.edit_pset', ifc_file, pset=pset, properties=properties)
+
+
+def test_occurrence_value_overrides_type_value():
+    ifc_file = ifcopenshell.open(SAMPLE)
+    relation = ifc_file.by_type('IfcRelDefinesByType')[0]
+    element = relation.RelatedObjects[0]
+    _add_pset(ifc_file, relation.RelatingType, 'Pset_Test', {'FireRating': 'REI30', 'Width': 0.2})
+    _add_pset(ifc_file, element, 'Pset_Test', {'FireRating': 'REI60', 'Width': 0.3})
+
+    index = ModelQueryIndex(ifc_file)
+
+    assert element.id() in index.query_ids(where={'Pset_Test.FireRating': 'REI60'})
+    assert element.id() not in index.query_ids(where={'Pset_Test.FireRating': 'REI30'})
+    assert element.id() in index.query_ids(ranges={'Pset_Test.Width': (0.25, None)})
+    assert element.id() not in index.query_ids(ranges={'Pset_Test.Width': (None, 0.25)})
+    # Other occurrences of the type keep the type value
+    for other in relation.RelatedObjects[1:]:
+        assert other.id() in index.query_ids(where={'Pset_Test.FireRating': 'REI30'})
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest
+
+# The Streamlit app folder is named 'streamlit', so the module is imported from that folder directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit'))
+
+from unit_registry import UnitRegistry, registry  # noqa: E402
+
+
+@pytest.mark.parametrize('value, from_unit, to_unit, expected', [
+    (1.0, 'kN/m', 'N/mm', 1.0),
+    (1.0, 'kN·m', 'J', 1000.0),
+    (1.0, 't/m³', 'kg/m^3', 1000.0),
+    (1.0, 'g/cm³', 'kg/m³', 1000.0),
+    (1.0, 'ha', 'm²', 10000.0),
+    (1.0, 'l', 'cm3', 1000.0),
+    (1.0, 'MPa', 'N/mm²', 1.0),
+    (1.0, 'lbf/ft', 'N/m', 4.4482216152605 / 0.3048),
+    (1.0, 'feet', 'meters', 0.3048),
+])
+def test_compound_units(value, from_unit, to_unit, expected):
+    assert registry.convert(value, from_unit, to_unit) == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize('value, from_unit, to_unit, expected', [
+    (0.0, '°C', '°F', 32.0),
+    (100.0, 'Celsius', 'Fahrenheit', 212.0),
+    (-40.0, 'degC', 'degF', -40.0),
+    (32.0, 'degF', 'degC', 0.0),
+    (212.0, 'degF', 'degC', 100.0),
+    (98.6, 'degF', 'degC', 37.0),
+    (0.0, 'degC', 'K', 273.15),
+    (273.15, 'Kelvin', 'degC', 0.0),
+])
+def test_temperature_offsets_are_exact(value, from_unit, to_unit, expected):
+    assert registry.convert(value, from_unit, to_unit) == expected
+
+
+def test_temperature_through_kelvin():
+    assert registry.convert(32.0, 'degF', 'K') == pytest.approx(273.15, rel=1e-12)
+    assert registry.convert(0.0, 'K', 'degF') == pytest.approx(-459.67, rel=1e-12)
+
+
+@pytest.mark.parametrize('from_unit, to_unit', [('kg', 'm'), ('kN/m', 'kN'), ('degC', 'm'), ('m²', 'm³')])
+def test_dimension_mismatch(from_unit, to_unit):
+    with pytest.raises(ValueError, match='different dimensions'):
+        registry.conversion(from_unit, to_unit)
+
+
+def test_offset_unit_in_compound_unit():
+    with pytest.raises(ValueError, match='offset'):
+        registry.conversion('degC/m', 'K/m')
+
+
+def test_unknown_and_circular_units():
+    with pytest.raises(ValueError, match='Unknown unit'):
+        registry.conversion('furlong', 'm')
+    circular = UnitRegistry(definitions=[('a', 2.0, 'b'), ('b', 3.0, 'a')])
+    with pytest.raises(ValueError, match='Circular'):
+        circular.conversion('a', 'm')